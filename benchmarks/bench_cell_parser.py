@@ -0,0 +1,92 @@
+"""
+Benchmark of the cell parser against the previous ast.literal_eval parsing.
+
+A 100k rows CSV collection is built from the rows of the Joysicles ledger,
+every cell is parsed both ways and the results are compared.
+
+Usage: python benchmarks/bench_cell_parser.py [rows]
+"""
+
+
+# Python default imports.
+from ast import literal_eval
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+
+
+""" Constants """
+ledger = os.path.join('data', 'Joysicles Collection', 'Joysicles Collection_verified.csv')
+
+
+""" Change type
+* The previous cell parsing, for comparison
+@Params:
+- nft_data: List of NFT data
+@Returns: List of elements
+"""
+def change_type(nft_data: list) -> list:
+    list_ = []
+
+    for data in nft_data:
+        element = str(data).strip()
+
+        try:
+            list_.append(literal_eval(element))
+
+        except Exception:
+            list_.append(element)
+
+    return list_
+
+
+""" Build rows
+* Repeats the ledger rows with unique names up to the number of rows
+@Params:
+- number: The number of rows
+@Returns: The list of CSV lines
+"""
+def build_rows(number: int) -> list:
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ledger)
+    lines = open(path, encoding='utf-8').read().splitlines()[1:]
+    rows = []
+
+    for index in range(number):
+        cells = lines[index % len(lines)].split(';; ')
+        cells[1] = f'Joysicle #{index}'  # Unique names like a real collection.
+        rows.append(';; '.join(cells))
+
+    return rows
+
+
+""" Timed
+* Parses every row with a parsing method
+@Params:
+- rows: The CSV lines
+- method: The parsing method
+@Returns: The parsed rows and the elapsed seconds
+"""
+def timed(rows: list, method) -> tuple:
+    start = time.perf_counter()
+    parsed = [method(row.split(';;')) for row in rows]
+    return parsed, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rows = build_rows(number)
+    parser = main.CellParser(main.settings['cell_cache'])
+
+    before, old_time = timed(rows, change_type)
+    after, new_time = timed(rows, lambda cells: [parser.parse(cell) for cell in cells])
+
+    if before != after:
+        main.exit('The cell parser returned different values.')
+
+    print(f'Rows: {number}')
+    print(f'literal_eval: {old_time:.2f} s')
+    print(f'Cell parser: {new_time:.2f} s ({old_time / new_time:.1f}x faster)')
+    print(f'Literal cache: {parser.parse_literal.cache_info()}')
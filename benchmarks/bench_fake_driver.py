@@ -0,0 +1,127 @@
+"""
+Throughput benchmark of every action with the in-memory fake browser.
+
+A generated collection is uploaded, verified and listed, then its sales
+are verified and a part of them relisted, and every NFT is deleted, with
+the workers, wallet flows, waits and ledgers of the bot but no Chrome.
+Reports the NFTs per second, the browser commands per NFT and the latency
+of every stage, so the bot's own overhead shows at large collection sizes.
+The waits poll the fake pages like Chrome, so every ended listing costs
+the timeout of the sale check.
+
+Usage: python benchmarks/bench_fake_driver.py [nfts] [workers] [latency] [timings report]
+"""
+
+
+# Python default imports.
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from tempfile import mkdtemp
+from queue import Queue
+import threading
+import shutil
+import sys
+import os
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+import main
+from bench_mock_opensea import build_collection, print_stages
+from fake_driver import FakeDriver
+
+
+""" Constants """
+credentials = ('fake password', 'fake recovery phrase')
+stages = (('upload, verify and sell', [1, 2, 3], ''), ('verify sales', [4], '_sale'), ('delete', [5], '_verified'))
+ended = 100  # Listings ended before the sale check, the other ones are still up.
+
+
+""" Run action
+* Processes a data file with the workers of the bot, like the main script
+@Params:
+- path: The data file
+- action: The actions to run
+- workers: The number of browser sessions
+- profiler: The profiler of the run
+@Returns: The elapsed seconds
+"""
+def run_action(path: str, action: list, workers: int, profiler: main.Profiler) -> float:
+    reader = main.Reader(path)
+    structure = main.Structure(reader, action)
+    retry = main.RetryPolicy()
+    registry = main.SelectorRegistry()
+    queue = Queue(maxsize=workers * 2)
+
+    start = time.perf_counter()
+    if 4 in action:  # Only the ended listings are verified.
+        structure.scheduler = main.SaleScheduler(structure)
+        structure.scheduler.load(reader)
+        feeder = threading.Thread(target=structure.scheduler.feed, args=(queue, workers), daemon=True)
+    else:
+        feeder = threading.Thread(target=main.feed_queue, args=(queue, structure, reader, workers), daemon=True)
+    feeder.start()
+
+    threads = [threading.Thread(target=main.run_worker, daemon=True,
+                                args=(queue, 1, credentials, structure, reader, '', profiler, retry, registry))
+               for _ in range(workers)]
+    [thread.start() for thread in threads]
+    [thread.join() for thread in threads]
+    structure.close()
+
+    return time.perf_counter() - start
+
+
+""" Expire sales
+* Ends the first fake listings and moves the sale dates of the ledger a month back
+@Params:
+- path: The sale ledger
+"""
+def expire_sales(path: str) -> None:
+    FakeDriver.expire(ended)
+    date = (datetime.now() - timedelta(days=31)).strftime(main.date_format)
+
+    lines = open(path, encoding='utf-8').read().splitlines()
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(lines[0] + '\n')
+        file.writelines(line.rsplit(';; ', 1)[0] + f';; {date}\n' for line in lines[1:])
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    workers = max(1, int(sys.argv[2])) if len(sys.argv) > 2 else 1
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+    report = sys.argv[4] if len(sys.argv) > 4 else ''
+
+    main.settings.update({'driver_factory': lambda wallet_url: FakeDriver(wallet_url, latency),
+                          'workers': workers, 'preflight': False})
+
+    folder = mkdtemp(prefix='fake_driver_')
+    collection = os.path.splitext(build_collection(folder, number))[0]
+    profiler = main.Profiler()
+    results = []
+
+    try:
+        for name, action, suffix in stages:
+            if 4 in action:
+                expire_sales(f'{collection}_sale.csv')
+            FakeDriver.totals.clear()
+
+            with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                elapsed = run_action(f'{collection}{suffix}.csv', action, workers, profiler)
+            results.append((name, elapsed, sum(FakeDriver.totals.values())))
+
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    assets = FakeDriver.assets.values()
+    print(f'\n{number} NFTs, {workers} workers, {latency * 1000:.1f} ms per command: '
+          f'{len(assets)} created, {sum(asset["deleted"] for asset in assets)} deleted.\n')
+    print(f'{"action":<26}{"time (s)":>10}{"NFTs/s":>10}{"commands/NFT":>14}')
+    for name, elapsed, commands in results:
+        print(f'{name:<26}{elapsed:>10.1f}{number / elapsed:>10.0f}{commands / number:>14.1f}')
+    print()
+    print_stages(profiler)
+
+    if report:
+        profiler.report(report)
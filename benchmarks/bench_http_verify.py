@@ -0,0 +1,80 @@
+"""
+Benchmark of the HTTP upload verification against the local mock of OpenSea.
+
+The uploads of the Joysicles ledger are created on the mock site
+(mock/server.py). Their nft_url is pointed to it, and every upload is
+verified over HTTP. A part of the URLs is broken on purpose, so those are
+left to the browser.
+
+Usage: python benchmarks/bench_http_verify.py [nfts] [latency] [concurrency]
+"""
+
+
+# Python default imports.
+from json import dumps, loads
+from tempfile import mkdtemp
+import urllib.request
+import shutil
+import sys
+import os
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+sys.path.insert(0, os.path.join(root, 'mock'))
+import main
+import server
+
+
+""" Constants """
+ledger = os.path.join(root, 'data', 'Joysicles Collection', 'Joysicles Collection_uploaded.csv')
+broken = 10  # One NFT out of ten has a missing page.
+
+
+""" Build ledger
+* Creates the NFTs on the mock site and writes their uploaded ledger
+@Params:
+- site: The running mock site
+- folder: The folder of the ledger
+- number: The number of NFTs
+@Returns: The ledger path
+"""
+def build_ledger(site, folder: str, number: int) -> str:
+    lines = open(ledger, encoding='utf-8').read().splitlines()
+    path = os.path.join(folder, 'mock_uploaded.csv')
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(lines[0] + '\n')
+        for index in range(number):
+            cells = lines[1 + index % (len(lines) - 1)].split(';; ')
+            cells[1] = f'Joysicle #{index}'
+            request = urllib.request.Request(f'{site.url}/api/assets', dumps({'name': cells[1]}).encode(),
+                                             {'Content-Type': 'application/json'})
+            cells[-1] = site.url + loads(urllib.request.urlopen(request).read())['url']
+            if index % broken == 0:  # Not created yet, like a just uploaded NFT.
+                cells[-1] += '0000'
+            file.write(';; '.join(cells) + '\n')
+
+    return path
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else main.settings['http_concurrency']
+
+    site = server.serve(latency=latency)
+    folder = mkdtemp(prefix='http_verify_')
+
+    try:
+        reader = main.Reader(build_ledger(site, folder, number))
+        structure = main.Structure(reader, [2])
+        remaining = main.HTTPVerifier(concurrency).run(structure, reader)
+        structure.close()
+
+        print(f'{number} NFTs with {latency * 1000:.0f} ms of latency and {concurrency} connections: '
+              f'{len(structure.verified)} verified, {remaining} left to the browser '
+              f'(expected {len(range(0, number, broken))}).')
+
+    finally:
+        site.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,118 @@
+"""
+End to end throughput benchmark against the local mock of OpenSea.
+
+The mock site (mock/server.py) is started on a free port and a headless Chrome
+uploads, verifies and lists a generated collection with the OpenSea class.
+Reports the NFTs per hour and the latency of every stage.
+
+Needs Chrome and its driver (found by Selenium if assets/chromedriver is missing).
+
+Usage: python benchmarks/bench_mock_opensea.py [nfts] [latency] [timings report] [tabs]
+"""
+
+
+# Python default imports.
+from tempfile import mkdtemp
+import shutil
+import sys
+import os
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+sys.path.insert(0, os.path.join(root, 'mock'))
+import main
+import server
+
+
+""" Constants """
+# A 1x1 transparent PNG, the media of every NFT.
+png = bytes.fromhex('89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+                    '1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082')
+row = ('{media};; Mock #{number};; https://example.com/{number};; Benchmark NFT number {number}.;; ;; '
+       '[["Background", "Blue"], ["Eyes", "Green"]];; [["Speed", 2, 5]];; [["Age", 1, 99]];; [False];; False;; '
+       '1;; Ethereum;; Fixed Price;; 0.01;; ["Sell with declining price", 0.001];; ["1 week"];; [False];; 1')
+
+
+""" Build collection
+* Writes the media file and a CSV data file of NFTs using it
+@Params:
+- folder: The folder of the collection
+- number: The number of NFTs
+@Returns: The data file path
+"""
+def build_collection(folder: str, number: int) -> str:
+    media = os.path.join(folder, 'mock.png')
+    open(media, 'wb').write(png)
+    # NFTRecord replaces the home folder of the data files (their first 3 path parts) by this one.
+    media = os.path.join(os.sep, 'home', 'user', os.path.relpath(media, os.path.expanduser('~')))
+
+    header = open(os.path.join(root, 'data', 'Templates', 'csv_structure_upload_and_sale.csv'),
+                  encoding='utf-8').readline().rstrip('\n')
+    path = os.path.join(folder, 'mock_collection.csv')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(header + '\n')
+        file.writelines(row.format(media=media, number=index + 1) + '\n' for index in range(number))
+
+    return path
+
+
+""" Print stages
+* Prints the latency of every flow measured by the profiler
+@Params:
+- profiler: The profiler of the run
+"""
+def print_stages(profiler: main.Profiler) -> None:
+    print(f'{"stage":<12}{"count":>7}{"p50 (s)":>10}{"p95 (s)":>10}{"max (s)":>10}')
+    for flow, timings in sorted(profiler.flows.items()):
+        stats = profiler.statistics(timings)
+        print(f'{flow:<12}{stats["count"]:>7}{stats["p50"]:>10}{stats["p95"]:>10}{stats["max"]:>10}')
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    report = sys.argv[3] if len(sys.argv) > 3 else ''
+    tabs = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+
+    site = server.serve(latency=latency)
+    main.settings.update({'opensea_url': site.url, 'wallet_url': f'{site.url}/wallet', 'headless': True})
+
+    folder = mkdtemp(prefix='mock_opensea_')
+    reader = main.Reader(build_collection(folder, number))
+    structure = main.Structure(reader, [1, 2, 3])
+    profiler = main.Profiler()
+    web = main.Webdriver(1, profiler=profiler)  # MetaMask.
+    opensea = main.OpenSea(1, 'mock password', 'mock recovery phrase', web, structure, reader)
+
+    try:
+        opensea.wallet_login()
+        opensea.opensea_login()
+
+        start = time.perf_counter()
+        if tabs > 1:  # Uploads pipelined in several tabs.
+            main.settings['tabs'] = tabs
+            pipeline = main.TabPipeline(opensea, tabs)
+            for nft in structure.records(reader):
+                pipeline.process(nft)
+            pipeline.drain()
+        else:
+            for nft in structure.records(reader):
+                main.process_nft(opensea, nft)
+        elapsed = time.perf_counter() - start
+
+    finally:
+        web.driver.quit()
+        structure.close()
+        site.shutdown()
+
+    state = site.store.state()
+    print(f'\n{number} NFTs in {elapsed:.1f} s with {latency * 1000:.0f} ms of latency and {tabs} tabs: '
+          f'{number / elapsed * 3600:.0f} NFTs/hour.')
+    print(f'Mock site: {state["created"]} created, {state["listed"]} listed, '
+          f'{len(structure.missing)} missing uploads.\n')
+    print_stages(profiler)
+
+    if report:
+        profiler.report(report)
+    shutil.rmtree(folder, ignore_errors=True)
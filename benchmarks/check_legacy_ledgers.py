@@ -0,0 +1,73 @@
+"""
+Regression check of the ledgers written before every line ended with a
+line break.
+
+Copies of the Joysicles ledgers, whose last line has no line break, are
+repaired, and a sale is ended in the sale ledger: no complete line may be
+lost. A last line cut by a crash is still removed.
+
+Usage: python benchmarks/check_legacy_ledgers.py
+"""
+
+
+# Python default imports.
+from contextlib import redirect_stdout
+from tempfile import mkdtemp
+import shutil
+import sys
+import os
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+import main
+
+
+""" Constants """
+collection = os.path.join(root, 'data', 'Joysicles Collection')
+
+
+""" Lines
+@Params:
+- path: The ledger path
+@Returns: The lines of the ledger, headers included
+"""
+def lines(path: str) -> list:
+    return open(path, encoding='utf-8').read().splitlines()
+
+
+if __name__ == '__main__':
+    folder = mkdtemp(prefix='legacy_ledgers_')
+
+    try:
+        for name in sorted(os.listdir(collection)):
+            path = shutil.copy(os.path.join(collection, name), folder)
+            before = lines(path)
+            assert not open(path, 'rb').read().endswith(b'\n'), f'{name} is not a legacy ledger.'
+
+            # The last line is complete, it only gets its line break.
+            assert not main.Journal.repair(path), f'{name} was truncated.'
+            assert lines(path) == before and open(path, 'rb').read().endswith(b'\n')
+
+            # A last line cut by a crash has less values than the headers.
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write(before[-1].rsplit(';; ', 3)[0])
+            with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                assert main.Journal.repair(path), f'The cut line of {name} was kept.'
+            assert lines(path) == before
+            print(f'{name}: {len(before) - 1} lines kept.')
+
+        # Ending one sale of a legacy sale ledger removes only its line.
+        path = shutil.copy(os.path.join(collection, 'Joysicles Collection_sale.csv'),
+                           os.path.join(folder, 'legacy_sale.csv'))
+        before = lines(path)
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            reader = main.Reader(path)
+            structure = main.Structure(reader, [4])
+            nft = next(structure.records(reader))
+            structure.end_sale(nft)
+            structure.close()
+        assert lines(path) == before[:1] + before[2:], 'The sale ledger lost other lines.'
+        print(f'Sale ledger: 1 ended sale removed, {len(before) - 2} lines kept.')
+
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
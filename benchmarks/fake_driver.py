@@ -0,0 +1,335 @@
+"""
+In-memory browser for the benchmarks, it simulates the wallet and the
+OpenSea pages instead of driving Chrome.
+
+Set it as the driver of the bot with:
+main.settings['driver_factory'] = lambda wallet_url: FakeDriver(wallet_url, latency, page_load)
+"""
+
+
+# Selenium module imports: pip install selenium
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import NoSuchWindowException
+
+# Python default imports.
+from collections import Counter
+from itertools import count
+import threading
+import sys
+import os
+import re
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+import main
+
+
+""" Fake element
+* Element of a fake page, stale once its page is reloaded or left
+"""
+class FakeElement:
+
+    """ Init
+    @Params:
+    - driver: The fake driver
+    - locator: The strategy and the value of the selector
+    """
+    def __init__(self, driver: 'FakeDriver', locator: tuple) -> None:
+        self.driver = driver
+        self.locator = locator
+        self.window = driver.current  # Window of the element.
+        self.load = self.window['load']
+
+    """ Check
+    * Counts a command on the element
+    @Params:
+    - command: The command name
+    """
+    def check(self, command: str) -> None:
+        self.driver.command(command)
+        if self.window['load'] != self.load or self.window['closed']:
+            raise StaleElementReferenceException('The fake page changed.')
+
+    def is_displayed(self) -> bool:
+        self.check('is_displayed')
+        return True
+
+    def is_enabled(self) -> bool:
+        self.check('is_enabled')
+        return True
+
+    def click(self) -> None:
+        self.check('click')
+        self.driver.click(self.locator[1])
+
+    def send_keys(self, *keys) -> None:
+        self.check('send_keys')
+        values = self.window['values']
+        values[self.locator[1]] = values.get(self.locator[1], '') + ''.join(map(str, keys))
+
+    def get_attribute(self, name: str) -> str:
+        self.check('get_attribute')
+        return self.window['values'].get(self.locator[1], 'Ethereum' if self.locator[1] == 'chain' else '')
+
+    @property
+    def text(self) -> str:
+        self.check('text')
+        return self.window['values'].get(self.locator[1], '')
+
+    @property
+    def location_once_scrolled_into_view(self) -> dict:
+        self.check('scroll')
+        return {'x': 0, 'y': 0}
+
+
+""" Fake driver
+* In-memory browser simulating the wallet and the OpenSea pages, it counts
+* the commands and waits for a latency instead of driving Chrome
+"""
+class FakeDriver:
+
+    # Assets of all the fake sessions: ID: {'name': name, 'listed': bool, 'deleted': bool}.
+    assets = {}
+    totals = Counter()  # Commands of the closed sessions.
+    ids = count(1)
+    lock = threading.Lock()
+
+    # Clicks opening a wallet pop up and signatures closing them, by selector.
+    popups = ('Coinbase Wallet', 'MetaMask")]', 'allow-authorize-button', 'button[type="submit"]', 'data-testid="Panel"')
+    signatures = ('sign-message', 'button btn-secondary')
+
+    """ Init
+    @Params:
+    - wallet_url: The page of the wallet tab
+    - latency: The seconds of every command
+    - page_load: The seconds of every page load
+    """
+    def __init__(self, wallet_url: str, latency: float = 0.0, page_load: float = 0.0) -> None:
+        self.base = main.settings['opensea_url'].rstrip('/')
+        self.latency = latency
+        self.page_load = page_load
+        self.commands = Counter()  # Command name: count.
+        self.windows = {}  # Handle: window state, the closed windows are forgotten.
+        self.opened = count()  # Number of the next window.
+        self.handles = []  # Open windows, by opening order.
+        self.opener = None  # OpenSea tab waiting for the signature of a pop up.
+        self.handle = self.open('wallet', wallet_url)
+        self.handle = self.open('opensea', 'data:,')
+        self.switch_to = self  # switch_to.window(), new_window() and frame().
+
+    """ Expire
+    * Ends the first listings, like if their duration was over
+    @Params:
+    - number: The number of listings to end, None for all of them
+    """
+    @classmethod
+    def expire(cls, number: int = None) -> None:
+        with cls.lock:
+            for asset in list(cls.assets.values())[:number]:
+                asset['listed'] = False
+
+    """ Command
+    * Counts a command and waits for its latency
+    @Params:
+    - name: The command name
+    """
+    def command(self, name: str) -> None:
+        self.commands[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    """ Open
+    * Opens a window
+    @Params:
+    - kind: wallet, opensea or popup
+    - url: The first page of the window
+    @Returns: The window handle
+    """
+    def open(self, kind: str, url: str) -> str:
+        handle = f'{kind}-{next(self.opened)}'
+        self.windows[handle] = {'kind': kind, 'url': url, 'load': 0, 'closed': False,
+                                'page': '', 'asset': None, 'values': {}, 'captcha': False, 'deleted': False}
+        self.handles.append(handle)
+        return handle
+
+    @property
+    def current(self) -> dict:
+        if self.handle not in self.windows:
+            raise NoSuchWindowException('The fake window is closed.')
+        return self.windows[self.handle]
+
+    """ Navigate
+    * Loads a page in the current window
+    @Params:
+    - url: The page URL
+    """
+    def navigate(self, url: str) -> None:
+        if self.page_load:
+            time.sleep(self.page_load)
+
+        window = self.current
+        window.update(url=url, load=window['load'] + 1, values={}, captcha=False, deleted=False)
+        path = url[len(self.base):].split('?')[0] if url.startswith(self.base) else ''
+        match = re.fullmatch(r'/assets/[a-z]+/0x[0-9a-f]+/(\d+)(/sell|/edit)?/?', path)
+
+        if match is None:
+            window.update(page=path.strip('/').split('/')[-1] or 'home', asset=None)
+            return
+        with self.lock:
+            asset = self.assets.get(int(match[1]))
+        if asset is None or asset['deleted']:  # Not found.
+            window.update(page='404', asset=None)
+        else:
+            window.update(page=(match[2] or '/asset')[1:], asset=asset)
+
+    """ Click
+    * Runs the action of a click on the current page
+    @Params:
+    - selector: The value of the clicked selector
+    """
+    def click(self, selector: str) -> None:
+        window = self.current
+
+        if any(popup in selector for popup in self.popups):  # A signature is asked.
+            if window['kind'] == 'opensea':
+                self.opener = self.handle
+            self.open('popup', f'{self.base}/popup')
+
+        elif any(signature in selector for signature in self.signatures):
+            for handle in [handle for handle in self.handles if self.windows[handle]['kind'] == 'popup']:
+                self.windows.pop(handle)['closed'] = True  # Its elements are stale.
+                self.handles.remove(handle)
+            opener = self.windows.get(self.opener)
+            if opener is not None and opener['page'] == 'login':  # Logged in.
+                self.handle, previous = self.opener, self.handle
+                self.navigate(f'{self.base}/asset/create')
+                self.handle = previous
+            elif opener is not None and opener['page'] == 'sell':
+                opener['asset']['listed'] = True
+
+        elif window['page'] == 'create' and 'submit' in selector:  # "Create" shows a captcha.
+            window['captcha'] = True
+
+        elif window['page'] == 'create' and 'recaptcha-anchor' in selector:  # The NFT is created.
+            name = window['values'].get('name', '')
+            with self.lock:
+                asset = next(self.ids)
+                self.assets[asset] = {'name': name, 'listed': False, 'deleted': False}
+            self.navigate(f'{self.base}/assets/ethereum/0x{asset:040x}/{asset}')
+
+        elif window['page'] == 'asset' and 'Edit' in selector:
+            self.navigate(f'{window["url"].rstrip("/")}/edit')
+
+        elif window['page'] == 'edit' and 'Overlayreact__Overlay' in selector:  # Deleted.
+            window['asset']['deleted'] = True
+            window['deleted'] = True
+
+    """ Present
+    * Checks if an element is on the current page
+    @Params:
+    - selector: The value of the selector
+    @Returns: Whether the element is found
+    """
+    def present(self, selector: str) -> bool:
+        window = self.current
+        if window['page'] == '404':
+            return False
+        if window['kind'] != 'opensea':  # Every wallet button.
+            return True
+
+        asset = window['asset']
+        title = re.search(r'@title="(.*)"', selector)
+        if title is not None:
+            return asset is not None and asset['name'] == title[1]
+        if 'Current price' in selector or 'Minimum bid' in selector or selector == 'header > h4':
+            return asset is not None and asset['listed']
+        if 'Almost done' in selector or selector == 'iframe':
+            return window['captcha']
+        if 'Deleted!' in selector:
+            return window['deleted']
+        return True
+
+    """ Find elements
+    @Params:
+    - by: The strategy of the selector
+    - value: The value of the selector
+    @Returns: The elements found, one at most
+    """
+    def find_elements(self, by: str, value: str) -> list:
+        self.command('find_elements')
+        return [FakeElement(self, (by, value))] if self.present(value) else []
+
+    def find_element(self, by: str, value: str) -> FakeElement:
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f'{value} is not on the fake page.')
+        return found[0]
+
+    def get(self, url: str) -> None:
+        self.command('get')
+        self.navigate(url)
+
+    def refresh(self) -> None:
+        self.command('refresh')
+        self.navigate(self.current['url'])
+
+    @property
+    def current_url(self) -> str:
+        return self.current['url']
+
+    @property
+    def current_window_handle(self) -> str:
+        return self.handle
+
+    @property
+    def window_handles(self) -> list:
+        self.command('window_handles')
+        return list(self.handles)
+
+    """ Window
+    * Switches to a window, switch_to.window()
+    @Params:
+    - handle: The window handle
+    """
+    def window(self, handle: str) -> None:
+        self.command('switch_to_window')
+        self.handle = handle
+
+    def new_window(self, kind: str = 'tab') -> None:
+        self.command('new_window')
+        self.handle = self.open('opensea', 'about:blank')
+
+    def frame(self, reference) -> None:  # The captcha is on the same fake page.
+        self.command('switch_to_frame')
+
+    def execute_script(self, script: str, *args):
+        self.command('execute_script')
+        if script.startswith('arguments[0].click()'):
+            args[0].click()
+
+    """ Execute async script
+    * Runs the fill scripts of the Webdriver on the fake page
+    @Returns: The values read back by the script
+    """
+    def execute_async_script(self, script: str, *args):
+        self.command('execute_async_script')
+        if script == main.Webdriver.fill_rows_script:
+            return args[2]
+        if script == main.Webdriver.fill_values_script:
+            for (_, value), text in args[0]:
+                self.current['values'][value] = text
+            return [text for _, text in args[0]]
+
+    def execute_cdp_cmd(self, command: str, arguments: dict) -> dict:
+        self.command('execute_cdp_cmd')
+        return {}
+
+    def execute(self, command: str, params: dict = None) -> dict:  # Action chains.
+        self.command(command)
+        return {'value': None}
+
+    def quit(self) -> None:
+        self.command('quit')
+        with self.lock:
+            self.totals.update(self.commands)
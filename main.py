@@ -24,19 +24,101 @@ from selenium import webdriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait as WDW
 from selenium.common.exceptions import TimeoutException as TE
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 
 # Python default imports.
-from datetime import datetime as dt
+from datetime import datetime as dt, timedelta
+from itertools import count
+from queue import Queue
+from functools import lru_cache, wraps
+from contextlib import contextmanager
+from bisect import bisect_left
 from glob import glob
+import threading
+import atexit
+import heapq
+import random
+import sqlite3
+import math
+import re
 import os
 import time
 
 
 """ Constants """
 date_format = '%d-%m-%Y %H:%M'
+media_extensions = ('jpg', 'jpeg', 'png', 'gif', 'svg', 'mp4', 'webm', 'mp3', 'wav', 'ogg', 'glb', 'gltf')
+preview_extensions = ('jpg', 'jpeg', 'png', 'gif', 'svg')  # Audio, video and 3D files need a preview.
+max_media_size = 100 * 1024 ** 2  # Bytes.
+preflight_suffix = '_preflight.csv'  # Report of the invalid media files, next to the data file.
+media_index_suffix = '_media.json'  # Hashes of the uploaded media files, next to the data file.
+duplicates_suffix = '_duplicates.csv'  # Report of the NFTs whose media is already uploaded, next to the data file.
+ledger_header = ('file_path;; nft_name;; link;; description;; collection;; properties;; '
+                 'levels;; stats;; unlockable_content;; explicit_and_sensitive_content;; '
+                 'supply;; blockchain;; type;; price;; method;; duration;; specific_buyer;; '
+                 'quantity;; nft_url')
+
+
+""" Settings
+* Change these values to tune how the bot runs.
+"""
+settings = {
+    'workers': 1,  # Number of browser sessions uploading in parallel.
+    'tabs': 1,  # Number of OpenSea tabs pipelining the uploads in each browser session.
+    'profile': '',  # Chrome profile folder keeping the wallet and OpenSea logins, '' for none.
+    'stream_json': False,  # Read JSON files one NFT at a time instead of all at once.
+    'cell_cache': 4096,  # Number of parsed list cells kept by the cell parser.
+    'state_store': False,  # Keep the ledgers in an indexed SQLite file next to the data file.
+    'journal_interval': 1.0,  # Seconds between two writes of the CSV ledgers, 0 to write every NFT.
+    'journal_fsync': True,  # Force the ledger writes to the disk.
+    'timeout': 10,  # Seconds to wait for an element.
+    'poll_interval': 0.1,  # Seconds between two checks of an element.
+    'js_fallback': 2,  # Seconds before clicking a present but hidden element with JavaScript.
+    'selectors': '',  # JSON file overriding the selectors of the registry, '' for the built-in ones.
+    'bulk_traits': True,  # Fill the properties, levels and stats with one script, typed if it fails.
+    'fast_fill': True,  # Set the name, link, description and unlockable content with one script, typed if it fails.
+    'timings': '',  # JSON or CSV report of the time spent in every step, '' to disable.
+    'headless': False,  # Run Chrome without a window.
+    'page_load': 'normal',  # 'eager' stops waiting for the pages once their DOM is ready.
+    'block_resources': False,  # Don't load the images, videos, fonts and analytics scripts.
+    'window_size': '',  # Chrome window size, like '1024,768', '' for the default size.
+    'preflight': True,  # Check the media files of every NFT before the browser starts.
+    'skip_invalid': False,  # Don't upload the NFTs whose media files failed the check.
+    'media_index': False,  # Skip the NFTs whose media file is already uploaded under another name.
+    'optimize_media': False,  # Upload recompressed PNG and JPEG files without metadata, needs Pillow.
+    'retry_attempts': 3,  # Attempts of a login, contract or sale before giving up.
+    'retry_delay': 1.0,  # Seconds before the first retry, doubled at every retry.
+    'retry_max_delay': 30.0,  # Maximum seconds between two attempts.
+    'circuit_breaker': 3,  # Failed sales in a row before restarting the browser, 0 to never restart.
+    'http_verify': False,  # Verify the uploads over HTTP first, the browser only checks the unclear ones.
+    'http_concurrency': 8,  # Pages fetched at once by the HTTP verification.
+    'http_timeout': 10,  # Seconds to wait for a page of the HTTP verification.
+    'daemon': False,  # Keep verifying the sales and relist the NFTs as soon as their listing ends.
+    'sale_recheck': 3600,  # Seconds before checking again a listing still up after its end, in daemon mode.
+    'opensea_url': 'https://opensea.io',  # Change it to run against the mock site (mock/server.py).
+    'wallet_url': '',  # Mock wallet pages replacing the extension, '' to load the extension.
+    'driver_factory': None,  # Function building the driver from the wallet page instead of Chrome, for the benchmarks.
+}
+
+# Chrome Web Store IDs of the wallet extensions. [Coinbase, MetaMask]
+extension_ids = ('hnfanknocfeofbddgcijnmhnfnkdnaad', 'nkbihfbeogaeaoehlefnkodbefgpgknn')
+menu_actions = ([1, 2, 3], [1], [2], [3], [4], [5])  # Actions of each choice of the action menu.
+
+# Exit status of a run.
+status_done = 0  # Every NFT was processed.
+status_failed = 1  # Some NFTs failed, the next run continues from the ledgers.
+status_usage = 2  # Wrong arguments, config, data file or credentials.
+status_crashed = 3  # A browser session or a wallet login stopped.
+
+# URLs blocked with the block_resources setting, the XPaths don't need them.
+blocked_urls = ('*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.mp4', '*.webm',
+                '*.mp3', '*.wav', '*.ogg', '*.glb', '*.gltf', '*.woff', '*.woff2', '*.ttf',
+                '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+                '*segment.io*', '*segment.com*', '*amplitude.com*', '*sentry.io*',
+                '*hotjar.com*', '*intercom.io*', '*datadoghq.com*')
 
 
 """Colorama module constants."""
@@ -77,30 +159,642 @@ class Reader:
     * Saves JSON into a list of dictionaries
     """
     def extract_json_file(self) -> None:
+        if settings['stream_json']:  # Parsed while the NFTs are processed.
+            self.file = None
+            self.lenght_file = None  # Unknown until the end of the file.
+            return
+
         from json import loads 
 
         # Load and read the JSON file and extract "nft" part.
         self.file = loads(open(self.path, encoding='utf-8').read())['nft']
         self.lenght_file = len(self.file)  # Number of NFTs.
 
+    """ Stream json file
+    * Incrementally decodes the "nft" list, one dictionary at a time
+    @Params:
+    - chunk_size: The number of characters read at once
+    @Returns: A generator of the NFT dictionaries
+    """
+    def stream_json_file(self, chunk_size: int = 65536):
+        from json import JSONDecoder, JSONDecodeError
+
+        decoder = JSONDecoder()
+        key = re.compile(r'"nft"\s*:\s*\[')
+        with open(self.path, encoding='utf-8') as file:
+            buffer, position = '', 0
+
+            # Skip everything before the "nft" list.
+            while True:
+                chunk = file.read(chunk_size)
+                buffer += chunk
+                match = key.search(buffer)
+                if match:
+                    position = match.end()
+                    break
+                if not chunk:
+                    raise ValueError('The JSON file has no "nft" list.')
+
+            while True:
+                # Skip separators between two dictionaries.
+                while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                    position += 1
+
+                if position < len(buffer) and buffer[position] == ']':
+                    return  # End of the "nft" list.
+
+                try:
+                    if position >= len(buffer):
+                        raise JSONDecodeError('Need more data', buffer, position)
+                    nft, position = decoder.raw_decode(buffer, position)
+                    yield nft
+
+                except JSONDecodeError:  # The dictionary is cut, read the next chunk.
+                    chunk = file.read(chunk_size)
+                    if not chunk:
+                        raise ValueError('The JSON file is truncated.')
+                    buffer, position = buffer[position:] + chunk, 0
+
+    """ Rows
+    * Iterates over the NFTs of the data file
+    @Returns: A generator of the raw data of each NFT
+    """
+    def rows(self):
+        if self.extension == 'xlsx':
+            yield from self.stream_xlsx_file()
+
+        elif self.file is None:  # Streamed JSON file.
+            yield from self.stream_json_file()
+
+        else:
+            yield from self.file
+
     """ Extract CSV files
     * Saves the CSV file into a list of dictionaries
     """
     def extract_csv_file(self) -> None:
         # Open file and splitlines (every "\n") and remove headers.
         # It gets a list of each rows.
-        self.file = open(self.path, encoding='utf-8').read().splitlines()[1:]
+        lines = open(self.path, encoding='utf-8').read().splitlines()
+        self.file = lines[1:]
+
+        # A last line cut by a crash has less values than the headers.
+        if self.file and len(self.file[-1].split(';;')) < len(lines[0].split(';;')):
+            print(f'{yellow}Incomplete last line ignored.')
+            self.file.pop()
+
         self.lenght_file = len(self.file)  # Number of NFTs.
 
     """  Extract xlxs files
-    * Takes an xlxs file and saves it into a list of dictionaries
+    * Counts the rows of an xlxs file, they are read later one at a time
     """
     def extract_xlsx_file(self) -> None:
-        from pandas import read_excel
+        from openpyxl import load_workbook
+
+        # Read only mode streams the rows without keeping the cells.
+        workbook = load_workbook(self.path, read_only=True, data_only=True)
+        try:  # Counted like the stream_xlsx_file method skips them, the dimension has the empty rows.
+            self.lenght_file = sum(1 for row in workbook.active.iter_rows(min_row=2, values_only=True)
+                                   if self.filled(row))
+        finally:
+            workbook.close()
+
+        self.file = None  # Rows are read by the stream_xlsx_file method.
+
+    """ Filled
+    @Params:
+    - row: The values of an XLSX row
+    @Returns: Whether the row has a value
+    """
+    @staticmethod
+    def filled(row: tuple) -> bool:
+        return any(cell is not None for cell in row)
+
+    """ Stream xlsx file
+    * Reads the rows of the first sheet as typed values
+    @Returns: A generator of the NFT rows, empty cells as empty strings
+    """
+    def stream_xlsx_file(self):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            for row in workbook.active.iter_rows(min_row=2, values_only=True):
+                if self.filled(row):  # Skip empty rows.
+                    yield ['' if cell is None else cell for cell in row]
+        finally:
+            workbook.close()
+
+
+""" Cell parser
+* Parses the cells of CSV/XLSX rows like ast.literal_eval,
+* with fast paths for the most common values
+"""
+class CellParser:
+
+    # Plain numbers, anything else goes through literal_eval.
+    integer = re.compile(r'-?(?:0|[1-9][0-9]*)')
+    decimal = re.compile(r'-?[0-9]+\.[0-9]+')
+
+    # First characters a Python literal can start with.
+    literal_start = frozenset('0123456789.+-([{\'"')
+    constants = {'True': True, 'False': False, 'None': None}
+
+    """ Init
+    @Params:
+    - cache_size: The number of parsed literals kept in memory
+    """
+    def __init__(self, cache_size: int = 4096) -> None:
+        # Parsed lists are shared between rows, they must not be modified.
+        self.parse_literal = lru_cache(maxsize=cache_size)(self.literal)
+
+    """ Parse
+    * Changes the type of a cell value from string
+    @Params:
+    - data: The cell value
+    @Returns: The int/float/bool/list value or the stripped string
+    """
+    def parse(self, data):
+        # Typed XLSX values are already parsed.
+        if type(data) in (int, bool) or (type(data) is float and math.isfinite(data)):
+            return data
+
+        element = str(data).strip()  # Remove whitespaces.
+        if element == '':
+            return element
+
+        first = element[0]
+        if first not in self.literal_start:
+            if element in self.constants:
+                return self.constants[element]
+            # A name (text, path, URL...) is never a literal, except with
+            # a constant or a string prefix (b'', r''...) at its beginning.
+            if not element.startswith(('True', 'False', 'None')) and \
+                    '\'' not in element and '"' not in element:
+                return element
+
+        elif self.integer.fullmatch(element):
+            return int(element)
+
+        elif self.decimal.fullmatch(element):
+            return float(element)
+
+        return self.parse_literal(element)
+
+    """ Literal
+    * Evaluates a Python literal
+    @Params:
+    - element: The stripped cell value
+    @Returns: The evaluated value or the same string
+    """
+    @staticmethod
+    def literal(element: str):
+        from ast import literal_eval
+
+        try: # Change type of element (str to int/float/list/bool).
+            return literal_eval(element)
+
+        except Exception: # SyntaxError or ValueError.
+            return element
+
+
+""" NFT record
+* The typed data of one NFT, parsed once from its row
+"""
+class NFTRecord:
+
+    __slots__ = ('number', 'file_path', 'nft_name', 'link', 'description', 'collection',
+                 'properties', 'levels', 'stats', 'unlockable_content',
+                 'explicit_and_sensitive_content', 'supply', 'blockchain', 'type', 'price',
+                 'method', 'duration', 'specific_buyer', 'quantity', 'nft_url', 'sale_date',
+                 'sale_time')
+
+    """ Init
+    @Params:
+    - number: The position of the NFT in the data file, from 1
+    - nft_data: List of NFT data
+    """
+    def __init__(self, number: int, nft_data: list) -> None:
+        from sys import intern
+
+        # Missing trailing columns (upload only files) are empty.
+        nft_data = list(nft_data) + [''] * (20 - len(nft_data))
+        self.number: int = number
+
+        # Update the file path (and preview) to the local home path.
+        local_home_path = os.path.expanduser("~")
+        file_path = [self.local_path(path, local_home_path) for path in nft_data[0]] \
+            if isinstance(nft_data[0], list) else self.local_path(nft_data[0], local_home_path)
+
+        self.file_path: str or list = file_path
+        # Set string values to real string to prevent different types.
+        # Values repeated on every row are interned to be stored once.
+        self.nft_name: str = str(nft_data[1])  
+        self.link: str = intern(str(nft_data[2]))
+        self.description: str = intern(str(nft_data[3]).replace('_new_line_', '\n'))
+        self.collection: str = intern(str(nft_data[4]))
+        self.properties: list = nft_data[5]  # [[type, name], ...].
+        self.levels: list = nft_data[6]  # [[name, from, to], ...].
+        self.stats: list = nft_data[7]  # [[name, from, to], ...].
+        self.unlockable_content: list or bool = nft_data[8]  # [bool, str].
+        self.explicit_and_sensitive_content: bool = nft_data[9]
+        self.supply: int = nft_data[10]
+        self.blockchain: str = intern(str(nft_data[11]).capitalize())
+        self.type: str = intern(str(nft_data[12]).title())
+        self.price: float or int = nft_data[13]
+        self.method: list = nft_data[14]  # [method, price].
+        self.specific_buyer: list or bool = nft_data[16]
+        self.quantity: int = nft_data[17]
+        self.nft_url: str = str(nft_data[18])
+
+        # A single duration is a list of 1 value, a date range of 2 values.
+        duration = nft_data[15]
+        self.duration: list = [intern(duration)] if isinstance(duration, str) else duration
+
+        # Check for sale date
+        self.sale_date: str = str(nft_data[19]) if nft_data[19] != '' else None
+        self.sale_time: dt = None  # Parsed sale date.
+        if self.sale_date is not None:
+            try:
+                self.sale_time = dt.strptime(self.sale_date, date_format)
+            except ValueError:  # Badly written date.
+                pass
+
+    """ Local path
+    * Replaces the home folder of a path by the local home folder
+    @Params:
+    - path: The file path from the data file
+    - local_home_path: The home folder of this computer
+    @Returns: The local file path
+    """
+    @staticmethod
+    def local_path(path: str, local_home_path: str) -> str:
+        path = str(path)
+        home_path = os.path.sep.join(path.split(os.path.sep)[:3]) # Get the home path
+        return path.replace(home_path, local_home_path) # Replace the home path
+
+    """ Sale end
+    * Computes when the listing of the NFT ends
+    @Returns: The end of the sale, None if the sale date or the duration is unknown
+    """
+    def sale_end(self) -> dt:
+        if self.sale_time is None or not isinstance(self.duration, list) or not self.duration:
+            return None
+
+        try:
+            if len(self.duration) == 2:  # Date range.
+                end = dt.strptime(str(self.duration[1]), date_format)
+            else:
+                end = self.add_duration(self.sale_time, str(self.duration[0]))
+        except ValueError:  # Badly written date or unknown duration.
+            return None
+
+        return end + timedelta(minutes=1)  # Ended on OpenSea too.
+
+    """ Add duration
+    * Adds a listing duration like "3 days" or "1 month" to a date
+    @Params:
+    - start: The start date
+    - duration: The duration, a number and a unit (minute, hour, day, week, month or year)
+    @Returns: The end date
+    """
+    @staticmethod
+    def add_duration(start: dt, duration: str) -> dt:
+        match = re.fullmatch(r'\s*(\d+)\s*(minute|hour|day|week|month|year)s?\s*', duration.lower())
+        if match is None:
+            raise ValueError(f'Unknown duration: {duration}')
+        number, unit = int(match[1]), match[2]
+
+        if unit in ('month', 'year'):  # Same day of the month, the last one if shorter.
+            from calendar import monthrange
+
+            months = start.month - 1 + number * (12 if unit == 'year' else 1)
+            year, month = start.year + months // 12, months % 12 + 1
+            return start.replace(year=year, month=month, day=min(start.day, monthrange(year, month)[1]))
+
+        return start + timedelta(**{f'{unit}s': number})
+
+    """ Media
+    * Checks the media file of the NFT and its preview
+    @Returns: The absolute media path and preview path, '' without preview
+    """
+    def media(self) -> tuple:
+        paths = self.file_path if isinstance(self.file_path, list) else [self.file_path]
+        file_path = os.path.abspath(str(paths[0])) if paths and paths[0] != '' else ''
+        self.check_file(file_path, media_extensions)
+
+        # Audio, video and 3D files are shown with an image.
+        preview = ''
+        if os.path.splitext(file_path)[1][1:].lower() not in preview_extensions:
+            if len(paths) < 2 or paths[1] == '':
+                raise TE('A preview image is needed for audio, video and 3D files.')
+            preview = os.path.abspath(str(paths[1]))
+            self.check_file(preview, preview_extensions)
+
+        return file_path, preview
+
+    """ Check file
+    * Checks that a file can be uploaded to OpenSea
+    @Params:
+    - path: The file path
+    - extensions: The supported extensions
+    """
+    @staticmethod
+    def check_file(path: str, extensions: tuple) -> None:
+        if not path or not os.path.isfile(path):
+            raise TE('File doesn\'t exist or path is incorrect.')
+
+        # File size
+        if os.path.getsize(path) > max_media_size:
+            raise TE('File size must be less than 100 MegaBytes.')
+
+        # Check the file
+        if os.path.splitext(path)[1][1:].lower() not in extensions:
+            raise TE('The file extension is not supported on OpenSea.')
+
+        try:  # The browser must be able to read it.
+            with open(path, 'rb') as file:
+                file.read(1)
+        except OSError:
+            raise TE('File can\'t be read.')
+
+
+""" Journal
+* Ledger file kept open during the run, its lines are written at once and
+* forced to the disk by groups
+"""
+class Journal:
+
+    """ Init
+    @Params:
+    - path: The CSV ledger path
+    - interval: The seconds between two group commits, 0 to commit every line
+    - fsync: Whether the commits are forced to the disk
+    """
+    def __init__(self, path: str, interval: float = 1.0, fsync: bool = True) -> None:
+        self.path = path
+        self.interval = interval
+        self.fsync = fsync
+        self.dirty = False  # Lines written since the last commit.
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+
+        self.repair(path)
+        self.file = open(path, 'a', encoding='utf-8')
+        atexit.register(self.close)  # Don't lose the last group.
+
+        if self.interval > 0 and self.fsync:  # Background group commits.
+            threading.Thread(target=self.run, daemon=True).start()
+
+    """ Repair
+    * Ends the last line with a line break, or truncates it if it was cut by
+    * a crash. The older ledgers have no line break after their last line.
+    @Params:
+    - path: The CSV ledger path
+    @Returns: Whether the file was repaired
+    """
+    @staticmethod
+    def repair(path: str) -> bool:
+        with open(path, 'rb+') as file:
+            content = file.read()
+            if not content or content.endswith(b'\n'):
+                return False
+
+            # Only the headers, or a last line with as many values as the headers.
+            header = content.split(b'\n', 1)[0]
+            start = content.rfind(b'\n')
+            if start == -1 or content[start + 1:].count(b';;') == header.count(b';;'):
+                file.write(b'\n')  # The next lines start after a line break.
+                return False
+
+            file.truncate(start + 1)
+
+        print(f'{yellow}Incomplete last line removed from {os.path.basename(path)}.')
+        return True
+
+    """ Write
+    * Writes a line to the file now, it is forced to the disk by the next group commit
+    @Params:
+    - line: The CSV line, without line break
+    """
+    def write(self, line: str) -> None:
+        with self.lock:
+            self.file.write(f'{line}\n')
+            self.file.flush()  # Kept by the system even if the bot crashes.
+            self.dirty = True
+            if self.interval <= 0:
+                self.commit()
+
+    """ Commit
+    * Forces the lines written since the last commit to the disk, the lock must be held
+    """
+    def commit(self) -> None:
+        if not self.dirty or self.file.closed:
+            return
+
+        if self.fsync:
+            os.fsync(self.file.fileno())
+        self.dirty = False
+
+    """ Rewrite
+    * Replaces the file by its lines to keep, through a temporary file
+    @Params:
+    - keep: Function telling if a line is kept
+    """
+    def rewrite(self, keep) -> None:
+        with self.lock:  # No commit while the file is replaced.
+            self.commit()
+            self.file.close()
+
+            with open(self.path, encoding='utf-8') as file:
+                lines = file.read().splitlines()
+
+            with open(f'{self.path}.tmp', 'w', encoding='utf-8') as file:
+                file.write(f'{lines[0]}\n')  # Headers.
+                file.writelines(f'{line}\n' for line in lines[1:] if keep(line))
+                file.flush()
+                os.fsync(file.fileno())
+
+            os.replace(f'{self.path}.tmp', self.path)  # Atomic.
+            self.file = open(self.path, 'a', encoding='utf-8')
+
+    """ Run
+    * Forces the written lines to the disk every interval until closed
+    """
+    def run(self) -> None:
+        while not self.closed.wait(self.interval):
+            with self.lock:
+                self.commit()
+
+    """ Close
+    * Commits the last lines and closes the file
+    """
+    def close(self) -> None:
+        self.closed.set()
+        with self.lock:
+            if not self.file.closed:
+                self.commit()
+                self.file.close()
 
-        self.file = read_excel(self.path)
-        self.lenght_file = self.file.shape[0]
-        self.file = self.file.to_dict() 
+
+""" State store
+* Indexed SQLite copy of the uploaded, verified and sale ledgers
+"""
+class StateStore:
+
+    stages = ('uploaded', 'verified', 'sale')
+
+    """ Init
+    @Params:
+    - path: The SQLite file path
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.Lock()  # The connection is shared by the workers.
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.removed = set()  # Lines deleted by this run, not merged back from the CSV ledgers.
+
+        with self.lock, self.connection:
+            for stage in self.stages:  # One table per stage, the lines keep the CSV format.
+                self.connection.execute(
+                    f'CREATE TABLE IF NOT EXISTS {stage} (id INTEGER PRIMARY KEY, '
+                    'nft_name TEXT NOT NULL, nft_url TEXT, sale_date TEXT, line TEXT NOT NULL)')
+                self.connection.execute(f'CREATE INDEX IF NOT EXISTS {stage}_nft_name ON {stage} (nft_name)')
+                self.connection.execute(f'CREATE INDEX IF NOT EXISTS {stage}_nft_url ON {stage} (nft_url)')
+
+    """ Stage
+    @Params:
+    - stage: The ledger stage
+    @Returns: A set-like view of the NFT names of the stage
+    """
+    def stage(self, stage: str) -> 'StoreStage':
+        return StoreStage(self, stage)
+
+    """ Contains
+    @Params:
+    - stage: The ledger stage
+    - column: The indexed column, nft_name or nft_url
+    - value: The value to look for
+    @Returns: Whether the stage has a row with this value
+    """
+    def contains(self, stage: str, column: str, value: str) -> bool:
+        with self.lock:
+            return self.connection.execute(
+                f'SELECT 1 FROM {stage} WHERE {column} = ? LIMIT 1', (value,)).fetchone() is not None
+
+    """ Count
+    @Params:
+    - stage: The ledger stage
+    @Returns: The number of distinct NFTs of the stage
+    """
+    def count(self, stage: str) -> int:
+        with self.lock:
+            return self.connection.execute(f'SELECT COUNT(DISTINCT nft_name) FROM {stage}').fetchone()[0]
+
+    """ Add
+    * Saves a ledger line in one transaction
+    @Params:
+    - stage: The ledger stage
+    - line: The CSV line of the NFT
+    - data: The NFT record
+    """
+    def add(self, stage: str, line: str, data: 'NFTRecord') -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                f'INSERT INTO {stage} (nft_name, nft_url, sale_date, line) VALUES (?, ?, ?, ?)',
+                (data.nft_name, data.nft_url, data.sale_date, line))
+
+    """ Remove
+    * Deletes the lines of an NFT
+    @Params:
+    - stage: The ledger stage
+    - nft_name: The NFT name
+    - sale_date: Only the line with this sale date, None for all of them
+    """
+    def remove(self, stage: str, nft_name: str, sale_date: str = None) -> None:
+        where, values = ('nft_name = ?', (nft_name,)) if sale_date is None else \
+            ('nft_name = ? AND sale_date = ?', (nft_name, sale_date))
+
+        with self.lock, self.connection:
+            self.removed.update((stage, line) for (line,) in self.connection.execute(
+                f'SELECT line FROM {stage} WHERE {where}', values))
+            self.connection.execute(f'DELETE FROM {stage} WHERE {where}', values)
+
+    """ Import CSV
+    * Merges the lines of a CSV ledger missing from its stage in one transaction,
+    * like the lines appended by a run without the state store
+    @Params:
+    - stage: The ledger stage
+    - path: The CSV ledger path
+    """
+    def import_csv(self, stage: str, path: str) -> None:
+        with self.lock:
+            known = {line for (line,) in self.connection.execute(f'SELECT line FROM {stage}')}
+
+        rows = []
+        for line in open(path, encoding='utf-8').read().splitlines()[1:]:
+            cells = line.split(';; ')
+            if len(cells) < 19 or line in known or (stage, line) in self.removed:  # Broken or known line.
+                continue
+            known.add(line)
+            rows.append((cells[1], cells[18], cells[19] if len(cells) > 19 else None, line))
+
+        with self.lock, self.connection:
+            self.connection.executemany(
+                f'INSERT INTO {stage} (nft_name, nft_url, sale_date, line) VALUES (?, ?, ?, ?)', rows)
+
+    """ Lines
+    @Params:
+    - stage: The ledger stage
+    @Returns: The CSV lines of the stage
+    """
+    def lines(self, stage: str) -> list:
+        with self.lock:
+            return [line for (line,) in self.connection.execute(f'SELECT line FROM {stage} ORDER BY id')]
+
+    """ Export CSV
+    * Writes a stage to its CSV ledger, replaced at once
+    @Params:
+    - stage: The ledger stage
+    - path: The CSV ledger path
+    - header: The CSV header
+    """
+    def export_csv(self, stage: str, path: str, header: str) -> None:
+        with self.lock:
+            lines = self.connection.execute(f'SELECT line FROM {stage} ORDER BY id')
+            with open(f'{path}.tmp', 'w', encoding='utf-8') as file:
+                file.write(f'{header}\n')
+                for (line,) in lines:
+                    file.write(f'{line}\n')
+        os.replace(f'{path}.tmp', path)
+
+    """ Close
+    * Closes the SQLite connection
+    """
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+""" Store stage
+* Set-like view of the NFT names of a state store stage
+"""
+class StoreStage:
+
+    """ Init
+    @Params:
+    - store: The state store
+    - stage: The ledger stage
+    """
+    def __init__(self, store: StateStore, stage: str) -> None:
+        self.store = store
+        self.stage = stage
+
+    def __contains__(self, nft_name: str) -> bool:
+        return self.store.contains(self.stage, 'nft_name', nft_name)
+
+    def __len__(self) -> int:
+        return self.store.count(self.stage)
 
 
 """ Structure
@@ -110,21 +804,45 @@ class Structure:
 
     """ Init
     @Params: 
+    - reader: The reader of the data file
     - action: The actions choosen
     """
-    def __init__(self, action: list) -> None:
-        self.file = reader.file.copy()  # File data copy.
+    def __init__(self, reader: Reader, action: list) -> None:
         self.extension = reader.extension  # File extension copy.
+        total = reader.lenght_file or '?'  # Unknown for streamed files.
+
+        # Method structuring a row: self.structure_{FILE_EXTENSION}
+        self.structure_row = getattr(self, f'structure_{self.extension}')
+        self.parser = CellParser(settings['cell_cache'])
         self.action = action  # 1, 2, 3, 4 or 1,2 and 3.
-        self.uploaded = []
-        self.verified = []
+        self.lock = threading.Lock()  # Serializes the ledger writes.
+        self.uploaded = set()
+        self.verified = set()
         self.missing = []
-        self.sold = []
+        self.failed = []  # NFTs whose upload, sale, sale check or deletion failed.
+        self.crashed = 0  # Workers stopped by an error.
+        self.running = 0  # Workers taking NFTs from the queue.
+        self.unprocessed = 0  # NFTs left in the queue after every worker stopped.
+        self.feed_error = None  # Error that stopped the feeder thread, reported by the main thread.
+        self.sold = set()
+        self.stages = {}  # Ledger file: stage name.
+        self.journals = {}  # Ledger file: open journal.
+        self.ended = set()  # Tombstones of the ended sales: (nft_name, sale_date).
+        self.scheduler = None  # Sale scheduler of the sale verification.
+        self.optimized = {}  # Media file: its optimized copy uploaded instead.
+        self.duplicates = {}  # NFT number: (nft_name, uploaded name, nft_url) of a media uploaded as another NFT.
 
         # File name constants
         uploaded_suffix = "uploaded"
         verified_suffix = "verified"
         sale_suffix = "sale"
+
+        # One SQLite state file for all the ledgers of the collection.
+        self.store = None
+        if settings['state_store']:
+            collection = re.sub(f'_({uploaded_suffix}|{verified_suffix}|{sale_suffix})$',
+                                '', os.path.splitext(reader.path)[0])
+            self.store = StateStore(f'{collection}_state.db')
             
         # Record uploads
         if 1 in self.action:
@@ -137,21 +855,8 @@ class Structure:
             file_path = os.path.splitext(reader.path)[0]
             self.uploaded_file = f'{file_path}_{uploaded_suffix}.csv'
             
-            # Check to see if the file exists first before creating it
             # This is useful if continuing an existing upload of large collections
-            if not os.path.exists(self.uploaded_file):
-                print('Creating uploaded file.')
-
-                with open(self.uploaded_file, 'a+', encoding='utf-8') as file:
-                    file.write('file_path;; nft_name;; link;; description;; collection;; properties;; '
-                        'levels;; stats;; unlockable_content;; explicit_and_sensitive_content;; '
-                        'supply;; blockchain;; type;; price;; method;; duration;; specific_buyer;; '
-                        'quantity;; nft_url')
-
-            else: # Otherwise read the existing file
-                items = Reader(self.uploaded_file).file
-                self.uploaded = list(map(lambda item: str(item.split(';; ')[1]), items))
-                print(f'You have already uploaded {len(self.uploaded)} of {len(self.file)} NFTs.')
+            self.uploaded = self.ledger('uploaded', self.uploaded_file, total)
 
         # Record verified
         if 2 in self.action:
@@ -168,21 +873,8 @@ class Structure:
             else:
                 self.verified_file = file_path.replace(f'{uploaded_suffix}', file_suffix)
 
-            # Check to see if the file exists first before creating it
             # This is useful if continuing an existing verification of large collections
-            if not os.path.exists(self.verified_file):
-                print('Creating verified file.')
-
-                with open(self.verified_file, 'a+', encoding='utf-8') as file:
-                    file.write('file_path;; nft_name;; link;; description;; collection;; properties;; '
-                        'levels;; stats;; unlockable_content;; explicit_and_sensitive_content;; '
-                        'supply;; blockchain;; type;; price;; method;; duration;; specific_buyer;; '
-                        'quantity;; nft_url')
-
-            else: # Otherwise read the existing file
-                items = Reader(self.verified_file).file
-                self.verified = list(map(lambda item: str(item.split(';; ')[1]), items))
-                print(f'You have already verified {len(self.verified)} of {len(self.file)} NFTs.')
+            self.verified = self.ledger('verified', self.verified_file, total)
 
         # Sell
         if 3 in self.action:
@@ -200,21 +892,8 @@ class Structure:
                 self.sale_file = file_path.replace(f'{verified_suffix}', file_suffix).replace(f'{sale_suffix}', file_suffix)
             self.sale_file = f'{self.sale_file}.csv'
 
-            # Check to see if the file exists first before creating it
             # This is useful if continuing an existing sale of large collections
-            if not os.path.exists(self.sale_file):
-                print('Creating sold file.')
-
-                with open(self.sale_file, 'a+', encoding='utf-8') as file:
-                    file.write('file_path;; nft_name;; link;; description;; collection;; properties;; '
-                        'levels;; stats;; unlockable_content;; explicit_and_sensitive_content;; '
-                        'supply;; blockchain;; type;; price;; method;; duration;; specific_buyer;; '
-                        'quantity;; nft_url;; sale_date')
-
-            else: # Otherwise read the existing file
-                items = Reader(self.sale_file).file
-                self.sold = list(map(lambda item: str(item.split(';; ')[1]), items))
-                print(f'You have already sold {len(self.sold)} of {len(self.file)} NFTs.')
+            self.sold = self.ledger('sale', self.sale_file, total)
 
         # Verify Sale
         if 4 in self.action:
@@ -226,42 +905,163 @@ class Structure:
             # Make sure to set up the sale file path
             self.sale_file = reader.path
 
+            # The ended sales are removed from the store too.
+            if self.store is not None and 3 not in self.action:
+                self.sold = self.ledger('sale', self.sale_file, total)
+
+
+    """ Ledger
+    * Creates a ledger file or reads the names it already contains
+    @Params:
+    - stage: The ledger stage (uploaded, verified or sale)
+    - save_file: The ledger file
+    - total: The number of NFTs of the data file
+    @Returns: The NFT names of the ledger, a set or a state store stage
+    """
+    def ledger(self, stage: str, save_file: str, total) -> set or 'StoreStage':
+        self.stages[save_file] = stage
+        header = ledger_header + (';; sale_date' if stage == 'sale' else '')
+        verb = {'uploaded': 'uploaded', 'verified': 'verified', 'sale': 'sold'}[stage]
+
+        # Check to see if the file exists first before creating it
+        if not os.path.exists(save_file):
+            print(f'Creating {verb} file.')
+
+            with open(save_file, 'a+', encoding='utf-8') as file:
+                file.write(f'{header}\n')
+
+        elif self.store is None:  # Remove a line cut by a crash before reading.
+            Journal.repair(save_file)
+
+        if self.store is not None:  # The CSV ledger may have lines the store doesn't have.
+            self.store.import_csv(stage, save_file)
+            names = self.store.stage(stage)
+
+        else: # Otherwise read the existing file
+            names = {str(item.split(';; ')[1]) for item in Reader(save_file).file}
+
+        if len(names) > 0:
+            print(f'You have already {verb} {len(names)} of {total} NFTs.')
+        return names
+
+    """ Ledger lines
+    * Reads the lines of a ledger without its header
+    @Params:
+    - save_file: The ledger file
+    @Returns: The lines with all their cells
+    """
+    def ledger_lines(self, save_file: str) -> list:
+        if self.store is not None:
+            lines = self.store.lines(self.stages[save_file])
+        else:
+            lines = open(save_file, encoding='utf-8').read().splitlines()[1:]
+        return [line for line in lines if len(line.split(';; ')) >= 19]
+
+    """ End sale
+    * Marks the sale line of an NFT as ended, in O(1)
+    @Params:
+    - nft: The NFT whose sale has ended
+    """
+    def end_sale(self, nft: 'NFTRecord') -> None:
+        if self.store is not None:  # Exported over the CSV ledger at the end.
+            self.store.remove('sale', nft.nft_name, nft.sale_date)
+        else:
+            with self.lock:
+                self.ended.add((nft.nft_name, nft.sale_date))
+
+    """ Restore sale
+    * Keeps the sale line of an NFT that could not be listed again
+    @Params:
+    - nft: The NFT whose sale was marked as ended
+    """
+    def restore_sale(self, nft: 'NFTRecord') -> None:
+        if self.store is not None:
+            self.save_nft(self.sale_file, nft)
+        else:
+            with self.lock:
+                self.ended.discard((nft.nft_name, nft.sale_date))
+
+    """ Compact
+    * Removes the ended sales from the sale file in a single rewrite
+    """
+    def compact(self) -> None:
+        with self.lock:
+            if not self.ended:
+                return
+            ended, self.ended = self.ended, set()
+
+            if self.sale_file not in self.journals:
+                self.journals[self.sale_file] = Journal(
+                    self.sale_file, settings['journal_interval'], settings['journal_fsync'])
+
+        # Keep a line unless its name and sale date are a tombstone.
+        def keep(line: str) -> bool:
+            cells = line.split(';; ')
+            return len(cells) < 20 or (cells[1], cells[19]) not in ended
+
+        self.journals[self.sale_file].rewrite(keep)
+        print(f'{green}{len(ended)} ended sales removed from the sale file.')
+
+    """ Close
+    * Exports the state store to the CSV ledgers at the end of the run,
+    * with the lines appended to them meanwhile
+    """
+    def close(self) -> None:
+        self.compact()  # Remove the ended sales.
+
+        for journal in self.journals.values():
+            journal.close()
+
+        if self.store is None:
+            return
+
+        for save_file, stage in self.stages.items():
+            header = ledger_header + (';; sale_date' if stage == 'sale' else '')
+            self.store.import_csv(stage, save_file)
+            self.store.export_csv(stage, save_file, header)
+        self.store.close()
 
     """ Get data
     * Gets the NFT data
     @Params:
-    - nft_number: The nft currently in use
+    - nft_number: The index of the NFT in the data file
+    - nft_data: The raw data of the NFT read from the file
+    @Returns: The parsed NFT record
     """
-    def get_data(self, nft_number: int) -> None:
-        self.nft_number = nft_number
+    def get_data(self, nft_number: int, nft_data) -> 'NFTRecord':
+        return NFTRecord(nft_number + 1, self.structure_row(nft_data))
 
-        # Eval function: self.structure_{FILE_EXTENSION}()
-        eval('self.structure_' + self.extension + '()')
+    """ Records
+    * Parses every NFT of the data file once, while it is read
+    @Params:
+    - reader: The reader of the data file
+    @Returns: A generator of NFT records
+    """
+    def records(self, reader: Reader):
+        for nft_number, nft_data in enumerate(reader.rows()):
+            yield self.get_data(nft_number, nft_data)
 
     """ Structure JSON
     * Transforms JSON dictionaries into list
     """
-    def structure_json(self) -> None:
-        nft_data = self.file[self.nft_number]
+    def structure_json(self, nft_data: dict) -> list:
         nft_data = [nft_data[data] for data in nft_data] # Get key's value from the NFT data.
 
         # Take each element in the list and check it and structure it
-        self.structure_data([self.dict_to_list(element) for element in nft_data])
+        return [self.dict_to_list(element) for element in nft_data]
 
     """ Structure CSV
     * Transforms CSV dictionaries into list
     """
-    def structure_csv(self) -> None:
+    def structure_csv(self, nft_data: str) -> list:
         # Note: each value is split every ";;", you can change the characters to others.
-        self.structure_data(self.change_type(self.file[self.nft_number].split(';;')))
+        return self.change_type(nft_data.split(';;'))
 
     """ Structure XLSX
     * Transforms XLSX dictionaries into list
     """
-    def structure_xlsx(self) -> None:
-        self.structure_data([
-            element.replace('nan', '').strip() if isinstance(element, str) else
-            element for element in self.change_type([self.file[element].get(self.nft_number) for element in self.file])])
+    def structure_xlsx(self, nft_data: list) -> list:
+        return self.change_type(nft_data)
 
     """ Dictionary to list
     * Transforms dictionaries to lists
@@ -298,106 +1098,978 @@ class Structure:
     @Returns: List of elements
     """
     def change_type(self, nft_data: list) -> list:
-        from ast import literal_eval 
+        return [self.parser.parse(data) for data in nft_data]
+
+    """ Save nft
+    * Saves the NFT data (Mainly the new NFT URL) as an uploaded list
+    @Params:
+    - save_file: The file to save
+    - data: The existing NFT data
+    """
+    def save_nft(self, save_file, data) -> None:
+        # Modify a few values for save
+        modified_description = data.description.replace('\n', '_new_line_')
+        duration = data.duration[0] if isinstance(data.duration, list) else data.duration
 
-        list_ = []
+        file_data = f'{data.file_path};; {data.nft_name};; {data.link};; {modified_description};; '\
+                f'{data.collection};; {data.properties};; {data.levels};; {data.stats};; '\
+                f'{data.unlockable_content};; {data.explicit_and_sensitive_content};; {data.supply};; '\
+                f'{data.blockchain};; {data.type};; {data.price};; {data.method};; {duration};; '\
+                f'{data.specific_buyer};; {data.quantity};; {data.nft_url}'
 
-        for data in nft_data: 
-            # Remove whitespaces.
-            element = str(data).strip()
+        # Check to add sale_date
+        if data.sale_date is not None:
+            print(f'| Sale Date: {data.sale_date}')
+            file_data = f'{file_data};; {data.sale_date}'
 
-            try: # Change type of element (str to int/float/list/bool).
-                list_.append(literal_eval(element))
+        if self.store is not None:  # Exported to the CSV ledger at the end.
+            self.store.add(self.stages[save_file], file_data, data)
 
-            except Exception: # SyntaxError or ValueError.
-                list_.append(element)
+        else:
+            with self.lock:  # Opened once for the whole run.
+                if save_file not in self.journals:
+                    self.journals[save_file] = Journal(
+                        save_file, settings['journal_interval'], settings['journal_fsync'])
+            self.journals[save_file].write(file_data)
 
-        return list_
+        print(f'{green}| Data saved!') # Save completed
 
-    """ Structur data
-    * Structures the NFT data into a typed object
-    @Params: 
-    - nft_data: List of NFT data
+
+""" Sale scheduler
+* Orders the listings by expiry in a min-heap and hands out the ended ones,
+* in daemon mode it sleeps until the next listing ends
+"""
+class SaleScheduler:
+
+    """ Init
+    @Params:
+    - structure: The structure and its sale ledger
+    - daemon: Whether to keep running and wait for the next listings to end
     """
-    def structure_data(self, nft_data: list) -> None:
+    def __init__(self, structure: Structure, daemon: bool = False) -> None:
+        self.structure = structure
+        self.daemon = daemon
+        self.heap = []  # (end of the listing, order, NFT).
+        self.order = count()  # Same ends are handed out in the file order.
+        self.condition = threading.Condition()  # Wakes the scheduler up on new listings.
+
+    """ Load
+    * Schedules every listing of the sale file
+    @Params:
+    - reader: The reader of the sale file
+    """
+    def load(self, reader: Reader) -> None:
+        for nft in self.structure.records(reader):
+            self.push(nft)
+
+        if not self.heap:
+            print(f'{yellow}No listing to check.')
+            return
+        now = dt.now()
+        ended = sum(1 for end, _, _ in self.heap if end <= now)
+        print(f'{len(self.heap)} listings scheduled, {ended} ended and {len(self.heap) - ended} still for sale.')
+
+    """ Push
+    * Schedules a listing
+    @Params:
+    - nft: The listed NFT
+    - end: When to check it, the end of the listing if None
+    @Returns: Whether the listing is scheduled
+    """
+    def push(self, nft: NFTRecord, end: dt = None) -> bool:
+        end = end or nft.sale_end()
+        if end is None:
+            print(f'{red}Unknown sale date or duration for -{nft.nft_name}, the sale is not checked.')
+            return False
 
-        # Get the local home path
-        from os.path import expanduser
-        local_home_path = expanduser("~")
+        with self.condition:
+            heapq.heappush(self.heap, (end, next(self.order), nft))
+            self.condition.notify()
+        return True
 
-        # Update the file path to local
-        file_path = nft_data[0]
-        home_path = os.path.sep.join(file_path.split(os.path.sep)[:3]) # Get the home path
-        file_path = file_path.replace(home_path, local_home_path) # Replace the home path
+    """ Done
+    * Schedules the next check of a verified listing in daemon mode
+    @Params:
+    - nft: The verified NFT
+    - relisted: Whether the NFT was listed again, with a new sale date
+    """
+    def done(self, nft: NFTRecord, relisted: bool) -> None:
+        if not self.daemon:
+            return
+        if relisted:
+            self.push(nft)
+        else:  # Still listed or the listing failed, check it again later.
+            self.push(nft, dt.now() + timedelta(seconds=settings['sale_recheck']))
+
+    """ Due
+    * Waits for the ended listings in daemon mode
+    @Returns: The NFTs whose listing ended, empty when there is nothing left to wait for
+    """
+    def due(self) -> list:
+        with self.condition:
+            while self.heap:
+                now = dt.now()
+                if self.heap[0][0] <= now:
+                    batch = []
+                    while self.heap and self.heap[0][0] <= now:
+                        batch.append(heapq.heappop(self.heap)[2])
+                    return batch
+
+                if not self.daemon:
+                    break
+                print(f'{yellow}Next listing ends on {self.heap[0][0].strftime(date_format)}, waiting.')
+                self.condition.wait((self.heap[0][0] - now).total_seconds())
+
+            return []
+
+    """ Feed
+    * Puts the ended listings in the work queue by batches
+    @Params:
+    - queue: The shared work queue
+    - workers: The number of workers to stop at the end
+    """
+    def feed(self, queue: Queue, workers: int) -> None:
+        try:
+            while True:
+                batch = self.due()
+                if not batch:
+                    break
+                for nft in batch:
+                    queue.put(nft)
+                queue.join()  # The whole batch is verified.
+                self.structure.compact()  # Remove the ended sales once per batch.
+        finally:
+            for _ in range(workers):
+                queue.put(None)
+
+    """ Stop
+    * Hands out the ended listings left without waiting for the next ones
+    """
+    def stop(self) -> None:
+        with self.condition:
+            self.daemon = False
+            self.condition.notify_all()
 
-        self.file_path: str or list = file_path
-        # Set string values to real string to prevent different types.
-        self.nft_name: str = str(nft_data[1])  
-        self.link: str = str(nft_data[2])  # 
-        self.description: str = str(nft_data[3]).replace('_new_line_', '\n')
-        self.collection: str = str(nft_data[4])
-        self.properties: list = nft_data[5]  # [[type, name], ...].
-        self.levels: list = nft_data[6]  # [[name, from, to], ...].
-        self.stats: list = nft_data[7]  # [[name, from, to], ...].
-        self.unlockable_content: list or bool = nft_data[8]  # [bool, str].
-        self.explicit_and_sensitive_content: bool = nft_data[9]
-        self.supply: int = nft_data[10]
-        self.blockchain: str = str(nft_data[11]).capitalize()
-        self.type: str = str(nft_data[12]).title()
-        self.price: float or int = nft_data[13]
-        self.method: list = nft_data[14]  # [method, price].
-        self.duration: list or str = nft_data[15]
-        self.specific_buyer: list or bool = nft_data[16]
-        self.quantity: int = nft_data[17]
-        self.nft_url: str = str(nft_data[18])
 
-        # Check for sale date
-        self.sale_date = None # Set it to nil first
-        if len(nft_data) >= 20:
-            self.sale_date: str = str(nft_data[19])
+""" Media index
+* Content-addressed index of the media files, their SHA-256 hashes are
+* cached by path, size and modification time
+"""
+class MediaIndex:
 
-    """ Is empty
-    * Checks if the dictionary is empty
+    """ Init
     @Params:
-    - element: The string value of the NFT
-    - data: The data value fo the NFT
-    - value: The value of the NFT
-    @Returns: Whether or not it was successful
+    - path: The JSON cache of the hashes
     """
-    def is_empty(self, element: str, data: str, value: str = '') -> bool:
-        if data != value:
-            web.send_keys(element, data)
-            return False
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.Lock()  # The files are hashed by a thread pool.
+        self.cache = {}  # Absolute path: [size, mtime, hash].
+        self.hashed = 0  # Files read during this run.
 
-        return True
+        if os.path.isfile(path):
+            from json import load
+
+            try:
+                with open(path, encoding='utf-8') as file:
+                    self.cache = load(file)
+            except ValueError:  # Cut by a crash, the files are hashed again.
+                print(f'{yellow}The media index is broken, it is built again.')
+
+    """ Hash file
+    * Hashes a file with a memory-mapped read
+    @Params:
+    - path: The file path
+    @Returns: The SHA-256 hex digest
+    """
+    @staticmethod
+    def hash_file(path: str) -> str:
+        import hashlib
+        import mmap
+
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:  # Empty files can't be mapped.
+                return hashlib.sha256().hexdigest()
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return hashlib.sha256(data).hexdigest()  # Releases the GIL while hashing.
+
+    """ Digest
+    * Gets the hash of a file, from the cache if it didn't change
+    @Params:
+    - path: The file path, or the media file and its preview
+    @Returns: The SHA-256 hex digest, None if the file can't be read
+    """
+    def digest(self, path: str or list) -> str:
+        if isinstance(path, list):  # The preview is not compared.
+            path = path[0] if path else None
+        if not path or not isinstance(path, str):
+            return None
+
+        try:
+            path = os.path.abspath(path)
+            stat = os.stat(path)
+            with self.lock:
+                cached = self.cache.get(path)
+            if cached and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+                return cached[2]
+
+            digest = self.hash_file(path)
+        except (OSError, ValueError):  # Missing, unreadable or mapped file error.
+            return None
+
+        with self.lock:
+            self.cache[path] = [stat.st_size, stat.st_mtime_ns, digest]
+            self.hashed += 1
+        return digest
+
+    """ Save
+    * Writes the cache, replaced at once
+    """
+    def save(self) -> None:
+        from json import dump
+
+        with open(f'{self.path}.tmp', 'w', encoding='utf-8') as file:
+            dump(self.cache, file)
+        os.replace(f'{self.path}.tmp', self.path)
+
+    """ Run
+    * Hashes the media of the NFTs to upload in a thread pool, finds the ones
+    * already uploaded under another name and reports the duplicates
+    @Params:
+    - structure: The structure parsing the NFT records
+    - reader: The reader of the data file
+    @Returns: The NFTs whose media is already uploaded, number: (nft_name, uploaded name, nft_url)
+    """
+    def run(self, structure: Structure, reader: Reader) -> set:
+        from concurrent.futures import ThreadPoolExecutor
+        from itertools import islice
+
+        print('\nIndexing the media files.')
+        with ThreadPoolExecutor() as pool:
+
+            # Media of the uploaded ledger: hash: (nft_name, nft_url).
+            lines = [line.split(';; ') for line in structure.ledger_lines(structure.uploaded_file)]
+            paths = [structure.parser.parse(cells[0]) for cells in lines]
+            uploaded = {digest: (cells[1], cells[18])
+                        for cells, digest in zip(lines, pool.map(self.digest, paths))
+                        if digest is not None and cells[18].startswith('http')}
+
+            seen = {}  # Hash: (number, nft_name) of its first NFT in the data file.
+            skipped, duplicates, indexed = {}, [], 0
+            records = (nft for nft in structure.records(reader) if nft.nft_name not in structure.uploaded)
+            while True:  # By batches, the records of large files are not all in memory.
+                batch = list(islice(records, 256))
+                if not batch:
+                    break
+                for nft, digest in zip(batch, pool.map(lambda nft: self.digest(nft.file_path), batch)):
+                    if digest is None:  # Reported by the preflight.
+                        continue
+                    indexed += 1
+                    if digest in uploaded:
+                        skipped[nft.number] = (nft.nft_name, *uploaded[digest])
+                    if digest in seen:
+                        duplicates.append((nft.number, nft.nft_name, *seen[digest]))
+                    else:
+                        seen[digest] = (nft.number, nft.nft_name)
+
+        self.save()
+        print(f'{green}{indexed} media files indexed, {self.hashed} hashed and the others cached.')
+
+        if skipped:  # Every skipped NFT and the one it duplicates, written next to the data file.
+            report = f'{os.path.splitext(reader.path)[0]}{duplicates_suffix}'
+            with open(report, 'w', encoding='utf-8') as file:
+                file.write('number;; nft_name;; uploaded_name;; nft_url\n')
+                file.writelines(';; '.join(map(str, (number, *row))) + '\n' for number, row in skipped.items())
+
+            print(f'{yellow}{len(skipped)} NFTs are not uploaded, their media is already uploaded:')
+            for number, (nft_name, uploaded_name, nft_url) in islice(skipped.items(), 20):
+                print(f'{yellow}| n°{number} -{nft_name} is uploaded as -{uploaded_name}: {nft_url}')
+            if len(skipped) > 20:
+                print(f'{yellow}| ... and {len(skipped) - 20} more.')
+            print(f'{yellow}Report saved to {report}.')
+
+        if duplicates:
+            print(f'{yellow}{len(duplicates)} NFTs have the same media as a previous one:')
+            for number, nft_name, first, first_name in duplicates[:20]:
+                print(f'{yellow}| n°{number} -{nft_name} is the same as n°{first} -{first_name}')
+            if len(duplicates) > 20:
+                print(f'{yellow}| ... and {len(duplicates) - 20} more.')
+
+        return skipped
+
+
+""" Optimize image
+* Recompresses an image without its metadata, run in a worker process
+@Params:
+- source: The original image
+- target: The optimized copy, only written if it is smaller
+@Returns: The sizes of the original and of the upload file
+"""
+def optimize_image(source: str, target: str) -> tuple:
+    from PIL import Image
+
+    size = os.path.getsize(source)
+    with Image.open(source) as image:
+        options = {'optimize': True}
+        if image.info.get('icc_profile'):  # The colors stay the same.
+            options['icc_profile'] = image.info['icc_profile']
+
+        if image.format == 'JPEG':  # Same quantization, no quality loss.
+            options.update(quality='keep', progressive=True)
+            orientation = image.getexif().get(0x0112)
+            if orientation:  # Only the orientation of the EXIF data is kept.
+                exif = Image.Exif()
+                exif[0x0112] = orientation
+                options['exif'] = exif.tobytes()
+
+        elif image.format != 'PNG':  # Recompressed in its own format only.
+            return size, size
+
+        image.save(f'{target}.tmp', image.format, **options)
+
+    optimized = os.path.getsize(f'{target}.tmp')
+    if optimized >= size:  # Already optimized, the original is uploaded.
+        os.remove(f'{target}.tmp')
+        open(f'{target}.skip', 'w').close()
+        return size, size
+
+    os.replace(f'{target}.tmp', target)
+    return size, optimized
+
+
+""" Media optimizer
+* Recompresses the PNG and JPEG files to upload in a process pool,
+* the copies are cached on disk by content hash
+"""
+class MediaOptimizer:
+
+    """ Init
+    @Params:
+    - folder: The folder of the optimized copies
+    - index: The media index hashing the files
+    """
+    def __init__(self, folder: str, index: MediaIndex) -> None:
+        self.folder = folder
+        self.index = index
+        self.names = set()  # NFTs uploading an optimized copy.
+        self.original = 0  # Bytes of the optimized files.
+        self.optimized = 0  # Bytes of their copies.
+
+    """ Run
+    * Optimizes the images of the NFTs to upload, the structure maps them to their copy
+    @Params:
+    - structure: The structure parsing the NFT records
+    - reader: The reader of the data file
+    """
+    def run(self, structure: Structure, reader: Reader) -> None:
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        from importlib.util import find_spec
+
+        if find_spec('PIL') is None:  # Optional dependency.
+            print(f'{yellow}Pillow is not installed, the media files are uploaded as they are.')
+            return
+
+        print('\nOptimizing the images.')
+        os.makedirs(self.folder, exist_ok=True)
+
+        # Images of the NFTs to upload, the previews are left as they are.
+        names = {}  # Image path: NFT names.
+        for nft in structure.records(reader):
+            path = nft.file_path[0] if isinstance(nft.file_path, list) and nft.file_path else nft.file_path
+            if nft.nft_name not in structure.uploaded and isinstance(path, str) and \
+                    os.path.splitext(path)[1][1:].lower() in ('png', 'jpg', 'jpeg'):
+                names.setdefault(path, []).append(nft.nft_name)
+
+        with ThreadPoolExecutor() as pool:
+            digests = dict(zip(names, pool.map(self.index.digest, names)))
+        self.index.save()
+
+        # Copies named by hash, the same image is only optimized once.
+        targets = {path: os.path.abspath(os.path.join(self.folder, digest + os.path.splitext(path)[1].lower()))
+                   for path, digest in digests.items() if digest is not None}
+        todo = {target: path for path, target in targets.items()
+                if not os.path.isfile(target) and not os.path.isfile(f'{target}.skip')}
+
+        if todo:
+            with ProcessPoolExecutor() as pool:
+                futures = {pool.submit(optimize_image, path, target): path for target, path in todo.items()}
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as error:  # Unreadable image, the original is uploaded.
+                        print(f'{red}| Could not optimize {futures[future]}. {error}')
+
+        for path, target in targets.items():
+            if os.path.isfile(target):
+                structure.optimized[os.path.abspath(path)] = target  # Same path as NFTRecord.media.
+                self.names.update(names[path])
+                self.original += os.path.getsize(path)
+                self.optimized += os.path.getsize(target)
+
+        saved = self.original - self.optimized
+        print(f'{green}{len(structure.optimized)}/{len(names)} images optimized ({len(todo)} now, '
+              f'the others cached), {saved / 1e6:.1f} MB saved '
+              f'({saved / (self.original or 1):.0%}).')
+
+    """ Report
+    * Prints the bytes saved and the upload time of the optimized NFTs against the others
+    @Params:
+    - profiler: The profiler of the run, None if the timings are disabled
+    """
+    def report(self, profiler: 'Profiler' = None) -> None:
+        if not self.names:
+            return
+        saved = self.original - self.optimized
+        print(f'\nOptimized media: {len(self.names)} NFTs, {saved / 1e6:.1f} MB saved '
+              f'({saved / (self.original or 1):.0%}).')
+
+        if profiler is None:
+            print(f'{yellow}Enable the timings to compare the upload times.')
+            return
+
+        times = {True: [], False: []}  # Optimized: seconds of the create flows.
+        for name, totals in profiler.nfts.items():
+            if 'create' in totals:
+                times[name in self.names].append(totals['create'])
+        for optimized, values in times.items():
+            if values:
+                label = 'optimized' if optimized else 'original'
+                print(f'| {label} media: {sum(values) / len(values):.2f} s per upload ({len(values)} NFTs)')
+
+
+""" HTTP verifier
+* Verifies the uploads by fetching the NFT pages without the browser,
+* with a pool of keep-alive connections and a bounded concurrency
+"""
+class HTTPVerifier:
+
+    """ Init
+    @Params:
+    - concurrency: The maximum number of pages fetched at once
+    - timeout: The seconds to wait for a page
+    """
+    def __init__(self, concurrency: int = None, timeout: float = None) -> None:
+        import urllib3  # Installed with Selenium.
+
+        self.concurrency = max(1, concurrency or settings['http_concurrency'])
+        self.errors = (urllib3.exceptions.HTTPError, OSError)
+        self.pool = urllib3.PoolManager(
+            maxsize=self.concurrency, block=True,  # One kept-alive connection per task.
+            timeout=urllib3.Timeout(total=timeout or settings['http_timeout']),
+            retries=urllib3.Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504)),
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                                   '(KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+                     'Accept-Language': 'en-US,en;q=0.9'})
+
+    """ Titles
+    @Params:
+    - page: The HTML of an NFT page
+    @Returns: The title attributes of the h1 headers
+    """
+    @staticmethod
+    def titles(page: str) -> set:
+        from html import unescape
+
+        return {unescape(title) for title in re.findall(r'<h1\b[^>]*?\stitle="([^"]*)"', page)}
+
+    """ Check
+    * Fetches the page of an NFT
+    @Params:
+    - nft: The NFT to verify
+    @Returns: True if the page shows the NFT, None if the browser must check it
+    """
+    def check(self, nft: NFTRecord) -> bool:
+        try:
+            response = self.pool.request('GET', nft.nft_url)
+        except self.errors:  # Unreachable, the browser will tell.
+            return None
+
+        # A just uploaded NFT can be a 404 page and OpenSea can answer with a challenge page.
+        if response.status != 200:
+            return None
+        page = response.data.decode('utf-8', 'replace')
+        return True if nft.nft_name in self.titles(page) else None
+
+    """ Verify
+    * Checks the NFTs concurrently and saves the verified ones
+    @Params:
+    - structure: The structure and its verified ledger
+    - records: The NFTs to verify
+    @Returns: The number of checked and verified NFTs
+    """
+    def verify(self, structure: Structure, records) -> tuple:
+        from concurrent.futures import ThreadPoolExecutor
+        from itertools import islice
+
+        checked = verified = 0
+        with ThreadPoolExecutor(self.concurrency) as executor:  # Its threads bound the pages fetched at once.
+            while True:  # By batches, the records of large files are not all in memory.
+                batch = list(islice(records, self.concurrency * 64))
+                if not batch:
+                    break
+                checked += len(batch)
+
+                for nft, result in zip(batch, executor.map(self.check, batch)):
+                    if result:
+                        structure.save_nft(structure.verified_file, nft)
+                        if isinstance(structure.verified, set):  # The state store stage is already updated.
+                            structure.verified.add(nft.nft_name)  # Skipped by the browser workers.
+                        verified += 1
+
+        return checked, verified
+
+    """ Run
+    * Verifies the NFTs of the data file missing from the verified ledger
+    @Params:
+    - structure: The structure parsing the NFT records
+    - reader: The reader of the data file
+    @Returns: The number of NFTs left to the browser
+    """
+    def run(self, structure: Structure, reader: Reader) -> int:
+        print('\nVerifying the uploads over HTTP.')
+        records = (nft for nft in structure.records(reader)
+                   if nft.nft_url and nft.nft_name not in structure.verified)
+        start = time.perf_counter()
+        checked, verified = self.verify(structure, records)
+        self.pool.clear()
+
+        print(f'{green}{verified}/{checked} uploads verified in {time.perf_counter() - start:.1f}s, '
+              f'{checked - verified} left to the browser.')
+        return checked - verified
+
+
+""" Timings
+* Exact count, total, maximum and histogram of a timed flow or step, the
+* percentiles are computed from a bounded reservoir of the timings
+"""
+class Timings:
+
+    size = 4096  # Timings kept for the percentiles, big runs time millions of steps.
+
+    """ Init """
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * len(Profiler.buckets)  # Number of timings in each bucket.
+        self.samples = []
+
+    """ Add
+    @Params:
+    - seconds: The timing
+    """
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.histogram[bisect_left(Profiler.buckets, seconds)] += 1
+
+        if len(self.samples) < self.size:
+            self.samples.append(seconds)
+        else:  # Every timing has the same chance to be kept.
+            index = random.randrange(self.count)
+            if index < self.size:
+                self.samples[index] = seconds
+
+
+""" Profiler
+* Times the Webdriver calls of every flow (upload, sell...) and NFT
+"""
+class Profiler:
+
+    # Upper bounds (seconds) of the latency histogram buckets.
+    buckets = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, float('inf'))
+
+    """ Init """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.context = threading.local()  # Flow and NFT of each worker.
+        self.steps = {}  # (flow, step): Timings.
+        self.flows = {}  # flow: Timings.
+        self.nfts = {}  # NFT name: {flow: seconds}.
+
+    """ Current
+    @Returns: The (flow, NFT) being timed in this worker
+    """
+    def current(self) -> tuple:
+        return getattr(self.context, 'flow', ('run', None))
+
+    """ Flow
+    * Times a whole flow of an NFT, the steps inside are tagged with it
+    @Params:
+    - name: The flow name
+    - nft: The NFT of the flow, None when logging in
+    """
+    @contextmanager
+    def flow(self, name: str, nft: 'NFTRecord' = None):
+        previous = self.current()
+        self.context.flow = (name, nft)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.context.flow = previous
+            with self.lock:
+                self.flows.setdefault(name, Timings()).add(seconds)
+                if nft is not None:
+                    totals = self.nfts.setdefault(nft.nft_name, {})
+                    totals[name] = totals.get(name, 0) + seconds
+
+    """ Step
+    * Times a Webdriver call of the current flow
+    @Params:
+    - method: The Webdriver method name
+    - target: The selector or the URL
+    """
+    @contextmanager
+    def step(self, method: str, target: str = ''):
+        flow, nft = self.current()
+        target = ', '.join(target) if isinstance(target, dict) else str(target)  # The fields, not their values.
+
+        # The values of the NFT are replaced to group the same steps of all NFTs.
+        if nft is not None:
+            if nft.nft_url:
+                target = target.replace(nft.nft_url, '{nft_url}')
+            if nft.nft_name:
+                target = target.replace(nft.nft_name, '{nft_name}')
+        step = f'{method} {target.split("?")[0]}'.strip()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self.lock:
+                if (flow, step) not in self.steps:
+                    self.steps[flow, step] = Timings()
+                self.steps[flow, step].add(seconds)
+
+    """ Statistics
+    @Params:
+    - timings: The timings of a flow or a step
+    @Returns: The count, total, p50, p95, max and histogram of the timings
+    """
+    def statistics(self, timings: Timings) -> dict:
+        values = sorted(timings.samples)
+        rank = lambda percent: values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+        return {'count': timings.count, 'total': round(timings.total, 3), 'p50': round(rank(50), 3),
+                'p95': round(rank(95), 3), 'max': round(timings.max, 3), 'histogram': list(timings.histogram)}
+
+    """ Report
+    * Writes the timings to a JSON or CSV file
+    @Params:
+    - path: The report file, CSV if it ends with .csv, JSON otherwise
+    """
+    def report(self, path: str) -> None:
+        with self.lock:
+            flows = [{'flow': flow, **self.statistics(timings)} for flow, timings in sorted(self.flows.items())]
+            steps = [{'flow': flow, 'step': step, **self.statistics(timings)}
+                     for (flow, step), timings in sorted(self.steps.items())]
+            nfts = [{'nft_name': name, 'flows': {flow: round(seconds, 3) for flow, seconds in totals.items()}}
+                    for name, totals in self.nfts.items()]
+
+        if path.lower().endswith('.csv'):
+            import csv
+
+            columns = ('count', 'total', 'p50', 'p95', 'max')
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['scope', 'flow', 'name', *columns, *[f'<={bound}s' if bound != float('inf') else 'slower' for bound in self.buckets]])
+                for row in flows:
+                    writer.writerow(['flow', row['flow'], '', *[row[key] for key in columns], *row['histogram']])
+                for row in steps:
+                    writer.writerow(['step', row['flow'], row['step'], *[row[key] for key in columns], *row['histogram']])
+                for row in nfts:  # Time spent by each NFT in each flow.
+                    for flow, seconds in row['flows'].items():
+                        writer.writerow(['nft', flow, row['nft_name'], 1, seconds, seconds, seconds, seconds])
+
+        else:
+            from json import dump
+
+            with open(path, 'w', encoding='utf-8') as file:
+                dump({'buckets': [str(bound) for bound in self.buckets], 'flows': flows,
+                      'steps': steps, 'nfts': nfts}, file, indent=2, ensure_ascii=False)
+
+        print(f'{green}Timings saved to {path}.')
+
+
+""" Timed
+* Decorator timing a Webdriver method when the profiler is on
+@Params:
+- method: The Webdriver method, its first argument is the selector or URL
+@Returns: The wrapped method
+"""
+def timed(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.profiler is None:
+            return method(self, *args, **kwargs)
+        with self.profiler.step(method.__name__, args[0] if args else ''):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+""" Flow
+* Decorator tagging the Webdriver calls of an OpenSea method with a flow
+@Params:
+- name: The flow name
+@Returns: The decorator
+"""
+def flow(name: str):
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.web.profiler is None:
+                return method(self, *args, **kwargs)
+            nft = args[0] if args and isinstance(args[0], NFTRecord) else None
+            with self.web.profiler.flow(name, nft):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+""" Permanent error
+* An error retrying can't fix, like a wrong value in the data file
+"""
+class PermanentError(TE):
+    pass
+
+
+""" Retry policy
+* Bounded retries with an exponential backoff and jitter, counted by flow.
+* A circuit breaker restarts the browser after too many failed flows in a row.
+"""
+class RetryPolicy:
+
+    """ Init
+    @Params:
+    - attempts: The maximum attempts of a flow
+    - delay: The seconds before the first retry, doubled at every retry
+    - max_delay: The maximum seconds between two attempts
+    - breaker: The failed flows in a row before restarting the browser, 0 to never restart
+    """
+    def __init__(self, attempts: int = None, delay: float = None,
+                 max_delay: float = None, breaker: int = None) -> None:
+        self.attempts = max(1, attempts or settings['retry_attempts'])
+        self.delay = settings['retry_delay'] if delay is None else delay
+        self.max_delay = settings['retry_max_delay'] if max_delay is None else max_delay
+        self.breaker = settings['circuit_breaker'] if breaker is None else breaker
+        self.lock = threading.Lock()
+        self.context = threading.local()  # Failed flows in a row of each worker.
+        self.counts = {}  # Flow: {calls, retries, failures, restarts}.
+
+    """ Count
+    @Params:
+    - name: The flow name
+    - key: calls, retries, failures or restarts
+    """
+    def count(self, name: str, key: str) -> None:
+        with self.lock:
+            counts = self.counts.setdefault(name, dict.fromkeys(('calls', 'retries', 'failures', 'restarts'), 0))
+            counts[key] += 1
+
+    """ Backoff
+    @Params:
+    - attempt: The number of the failed attempt, from 1
+    @Returns: The seconds to wait, half fixed and half random
+    """
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.delay * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    """ Run
+    * Calls a flow until it works or its attempts are spent
+    @Params:
+    - name: The flow name
+    - function: The flow, it raises an error when it fails
+    - restart: Restarts the browser session when the breaker opens, None to not count the flow
+    @Returns: The value returned by the flow
+    """
+    def run(self, name: str, function, *args, restart=None, **kwargs):
+        self.count(name, 'calls')
+
+        for attempt in range(1, self.attempts + 1):
+            try:
+                result = function(*args, **kwargs)
+
+            except PermanentError:  # The same error every time.
+                raise
+
+            except Exception as error:
+                if attempt == self.attempts:
+                    self.count(name, 'failures')
+                    if restart is not None:
+                        self.trip(name, restart)
+                    raise
+
+                self.count(name, 'retries')
+                delay = self.backoff(attempt)
+                print(f'{red}{name} failed, retry {attempt}/{self.attempts - 1} in {delay:.1f}s. {error}'.rstrip())
+                time.sleep(delay)
+
+            else:
+                if restart is not None:
+                    self.context.failures = 0
+                return result
+
+    """ Trip
+    * Counts a failed flow and restarts the browser when the breaker opens
+    @Params:
+    - name: The flow name
+    - restart: The restart of the browser session, it returns False to restart later
+    """
+    def trip(self, name: str, restart) -> None:
+        self.context.failures = getattr(self.context, 'failures', 0) + 1
+        if not self.breaker or self.context.failures < self.breaker:
+            return
+
+        try:
+            if restart() is False:  # Not now, the next failed flow tries again.
+                return
+        except Exception as error:  # The next failures will try again.
+            print(f'{red}Restarting the browser failed. {error}')
+        self.context.failures = 0
+        self.count(name, 'restarts')
+
+    """ Report
+    * Prints the retries of every flow
+    """
+    def report(self) -> None:
+        with self.lock:
+            counts = sorted((name, dict(values)) for name, values in self.counts.items()
+                            if values['retries'] or values['failures'])
+        if not counts:
+            return
+
+        print(f'\n{yellow}Retries by flow:')
+        for name, values in counts:
+            print(f'| {name}: {values["calls"]} calls, {values["retries"]} retries, '
+                  f'{values["failures"]} failed, {values["restarts"]} browser restarts.')
+
+
+""" Retried
+* Decorator running an OpenSea method with the retry policy
+@Params:
+- name: The flow name
+@Returns: The decorator
+"""
+def retried(name: str):
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return self.retry.run(name, method, self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+""" Selector registry
+* Versioned locators of the OpenSea pages by name, IDs and CSS rather than XPaths,
+* with the hit, miss and timeout counts of every selector
+"""
+class SelectorRegistry:
+
+    # Version of the selectors, the override files of another version are ignored.
+    version = 1
+
+    # Name: (strategy, value). The other selectors are XPaths.
+    defaults = {
+        # Create page.
+        'name': (By.ID, 'name'),
+        'external_link': (By.ID, 'external_link'),
+        'description': (By.ID, 'description'),
+        'media': (By.ID, 'media'),
+        'media_button': (By.CSS_SELECTOR, 'div[class*="FileInputreact__Container"]'),
+        'preview': (By.CSS_SELECTOR, 'input[name="preview"]'),
+        'trait_add': (By.CSS_SELECTOR, 'div[role="dialog"] > section > button'),
+        'trait_save': (By.CSS_SELECTOR, 'footer > button'),
+        'unlockable_toggle': (By.ID, 'unlockable-content-toggle'),
+        'unlockable_text': (By.CSS_SELECTOR, 'div[class*="unlockable"] > textarea'),
+        'explicit_toggle': (By.ID, 'explicit-content-toggle'),
+        'supply': (By.ID, 'supply'),
+        'chain': (By.ID, 'chain'),
+        'create': (By.CSS_SELECTOR, 'div[class*="submit"] > div > span > button'),
+        'captcha': (By.XPATH, '//h4[contains(text(), "Almost done")]'),
+        'captcha_anchor': (By.CSS_SELECTOR, '#recaptcha-anchor > div:first-of-type'),
+
+        # Sell page.
+        'price': (By.CSS_SELECTOR, '[name="price"]'),
+        'ending_price': (By.CSS_SELECTOR, '[name="endingPrice"]'),
+        'reserve_price': (By.CSS_SELECTOR, '[name="reservePrice"]'),
+        'quantity': (By.ID, 'quantity'),
+        'reserved_buyer': (By.ID, 'reservedBuyerAddressOrEnsName'),
+        'duration': (By.ID, 'duration'),
+        'duration_text': (By.CSS_SELECTOR, '#duration > div:nth-of-type(2)'),
+        'end_time': (By.ID, 'end-time'),
+        'start_time': (By.ID, 'start-time'),
+        'sell_submit': (By.CSS_SELECTOR, 'button[type="submit"]'),
+        'listed': (By.CSS_SELECTOR, 'header > h4'),
+
+        # Edit page.
+        'delete_confirm': (By.CSS_SELECTOR, 'div[class*="Overlayreact__Overlay"] > div > div > footer > div > button'),
+    }
 
-    """ Save nft
-    * Saves the NFT data (Mainly the new NFT URL) as an uploaded list
+    """ Init
     @Params:
-    - save_file: The file to save
-    - data: The existing NFT data
+    - path: JSON file overriding some selectors, '' for the defaults
     """
-    def save_nft(self, save_file, data) -> None:
-        with open(save_file, 'a+', encoding='utf-8') as file:
+    def __init__(self, path: str = '') -> None:
+        self.selectors = dict(self.defaults)
+        self.lock = threading.Lock()  # The counts are shared by the workers.
+        self.stats = {}  # Selector: {'hits': count, 'misses': count, 'timeouts': count}.
+        if path:
+            self.load(path)
+
+    """ Load
+    * Overrides the selectors with a file like {"version": 1, "selectors": {"name": ["id", "name"]}}
+    @Params:
+    - path: The JSON file
+    """
+    def load(self, path: str) -> None:
+        from json import load
 
-            # Modify a few values for save
-            modified_description = data.description.replace('\n', '_new_line_')
-            duration = data.duration[0] if isinstance(data.duration, list) else data.duration
+        with open(path, encoding='utf-8') as file:
+            data = load(file)
+        if data.get('version') != self.version:
+            print(f'{yellow}The selectors of {path} are for the version {data.get("version")}, '
+                  f'not {self.version}, they are ignored.')
+            return
 
-            file_data = f'\n{data.file_path};; {data.nft_name};; {data.link};; {modified_description};; '\
-                    f'{data.collection};; {data.properties};; {data.levels};; {data.stats};; '\
-                    f'{data.unlockable_content};; {data.explicit_and_sensitive_content};; {data.supply};; '\
-                    f'{data.blockchain};; {data.type};; {data.price};; {data.method};; {duration};; '\
-                    f'{data.specific_buyer};; {data.quantity};; {data.nft_url}'
+        self.selectors.update({name: tuple(locator) for name, locator in data.get('selectors', {}).items()})
+        print(f'{green}{len(data.get("selectors", {}))} selectors loaded from {path}.')
 
-            # Check to add sale_date
-            if hasattr(data, 'sale_date') and not data.sale_date is None:
-                print(f'| Sale Date: {data.sale_date}')
-                file_data = f'{file_data};; {data.sale_date}'
+    """ Locate
+    @Params:
+    - element: A selector name or an XPath
+    @Returns: The strategy and the value of the locator
+    """
+    def locate(self, element: str) -> tuple:
+        return self.selectors.get(element) or (By.XPATH, element)
 
-            file.write(file_data)
+    """ Count
+    @Params:
+    - element: The selector
+    - event: hits, misses or timeouts
+    """
+    def count(self, element: str, event: str) -> None:
+        with self.lock:
+            stats = self.stats.setdefault(element, {'hits': 0, 'misses': 0, 'timeouts': 0})
+            stats[event] += 1
 
-        print(f'{green}| Data saved!') # Save completed
+    """ Report
+    * Prints the totals and the selectors that timed out the most
+    """
+    def report(self) -> None:
+        if not self.stats:
+            return
+
+        totals = {event: sum(stats[event] for stats in self.stats.values()) for event in ('hits', 'misses', 'timeouts')}
+        print(f'\nSelectors: {totals["hits"]} cached, {totals["misses"]} looked up, {totals["timeouts"]} timed out.')
+        ranked = sorted(self.stats.items(), key=lambda item: (item[1]['timeouts'], item[1]['misses']), reverse=True)
+        for element, stats in ranked[:10]:
+            color = yellow if stats['timeouts'] else ''
+            print(f'{color}| {element}: {stats["hits"]} hits, {stats["misses"]} misses, {stats["timeouts"]} timeouts')
 
 
 """ Webdriveer
@@ -405,15 +2077,98 @@ class Structure:
 """
 class Webdriver:
 
+    # Adds the rows of a dialog table, sets their inputs with the native value setter
+    # and input events like React expects, then reads the values back.
+    fill_rows_script = '''
+        var [table, button, rows, done] = arguments;
+        var find = ([by, value]) => by == 'xpath' ? document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : by == 'id' ? document.getElementById(value) : document.querySelector(value);
+        var tick = () => new Promise(resolve => setTimeout(resolve, 20));
+        var setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+
+        (async () => {
+            for (var wait = 0; !find(table) && wait < 100; wait++) await tick();
+            if (!find(table)) return done(null);
+
+            while (find(table).rows.length < rows.length) {
+                var before = find(table).rows.length;
+                find(button).click();
+                for (var wait = 0; find(table).rows.length == before && wait < 100; wait++) await tick();
+                if (find(table).rows.length == before) return done(null);
+            }
+
+            rows.forEach((row, index) => {
+                var inputs = find(table).rows[index].querySelectorAll('input');
+                row.forEach((value, column) => {
+                    setter.call(inputs[column], value);
+                    inputs[column].dispatchEvent(new Event('input', {bubbles: true}));
+                    inputs[column].dispatchEvent(new Event('change', {bubbles: true}));
+                });
+            });
+
+            await tick();  // Controlled inputs are rendered again.
+            done(Array.from(find(table).rows, tr => Array.from(tr.querySelectorAll('input'), input => input.value)));
+        })().catch(() => done(null));
+    '''
+
+    # Sets text inputs and textareas with their native value setter and input events,
+    # then reads the values back.
+    fill_values_script = '''
+        var [fields, done] = arguments;
+        var find = ([by, value]) => by == 'xpath' ? document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : by == 'id' ? document.getElementById(value) : document.querySelector(value);
+        var tick = () => new Promise(resolve => setTimeout(resolve, 20));
+
+        (async () => {
+            for (var wait = 0; fields.some(([locator]) => !find(locator)) && wait < 100; wait++) await tick();
+
+            fields.forEach(([locator, value]) => {
+                var element = find(locator);
+                if (!element) return;
+                var prototype = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+                Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+                element.dispatchEvent(new Event('input', {bubbles: true}));
+                element.dispatchEvent(new Event('change', {bubbles: true}));
+            });
+
+            await tick();  // Controlled inputs are rendered again.
+            done(fields.map(([locator]) => find(locator) ? find(locator).value : null));
+        })().catch(() => done(null));
+    '''
+
     """ Init
     @Params: 
     - wallet: The wallet choice.  [Coingbase, Metamask]
+    - profile: The persistent Chrome profile folder, '' for a fresh profile
+    - profiler: The profiler timing the calls, None to disable
+    - registry: The selector registry shared by the workers, a new one if None
     """
-    def __init__(self, wallet: int) -> None:
+    def __init__(self, wallet: int, profile: str = '', profiler: 'Profiler' = None,
+                 registry: SelectorRegistry = None) -> None:
         self.webdriver_path = os.path.abspath('assets/chromedriver.exe') if \
             os.name == 'nt' else os.path.abspath('assets/chromedriver')
         wallet_extension = ('MetaMask', 'Coinbase')[wallet == 0]
         self.extension_path = os.path.abspath('assets/{}.crx'.format(wallet_extension))
+        self.profile = os.path.abspath(profile) if profile else ''
+
+        # Home page of the wallet, the extension or the mock wallet pages.
+        page = ('index.html', 'home.html')[wallet == 1]
+        self.wallet_url = f'{settings["wallet_url"].rstrip("/")}/{wallet_extension.lower()}/{page}' \
+            if settings['wallet_url'] else f'chrome-extension://{extension_ids[wallet]}/{page}'
+
+        # Wait engine configuration.
+        self.timeout = settings['timeout']
+        self.poll = settings['poll_interval']
+        self.js_fallback = settings['js_fallback']
+        self.js_clickable = set()  # Elements that were only clickable with JavaScript.
+        self.profiler = profiler
+        self.registry = registry or SelectorRegistry(settings['selectors'])
+        self.elements = {}  # Selector: element found since the last page load.
+
+        # OpenSea tabs of the tab pipeline, the wallet pop ups switch back to the current one.
+        self.tabs = []
+        self.tab = None
+
         self.driver = self.webdriver()  # Start new webdriver.
 
     """ Webdriver
@@ -421,41 +2176,233 @@ class Webdriver:
     @Returns: The app webdriver
     """
     def webdriver(self) -> webdriver:
+        if settings['driver_factory'] is not None:  # Another browser, like the in-memory one of the benchmarks.
+            return settings['driver_factory'](self.wallet_url)
+
         # Configure options for Chrome since that's what we are using.
         options = webdriver.ChromeOptions()
-        options.add_extension(self.extension_path)
+        if not settings['wallet_url']:  # The mock wallet pages don't need the extension.
+            options.add_extension(self.extension_path)
         options.add_argument("log-level=3")  # No logs is printed.
         options.add_argument("--mute-audio")  # Audio is muted.
+        if settings['headless']:
+            options.add_argument('--headless=new')
+        if settings['window_size']:  # A smaller window is cheaper to render.
+            options.add_argument(f'--window-size={settings["window_size"]}')
+
+        # Return from get() once the DOM is ready, the waits poll for the elements anyway.
+        options.page_load_strategy = settings['page_load']
+
+        # Keep the imported wallet and the OpenSea cookies between runs.
+        if self.profile:
+            options.add_argument(f'--user-data-dir={self.profile}')
 
         # Set webdriver language to English. - 2 methods.
         options.add_argument("--lang=en-US")  
-        options.add_experimental_option('prefs', {'intl.accept_languages': 'en,en_US'})
-
-        # DeprecationWarning using executable_path.
-        driver = webdriver.Chrome(service=Service(self.webdriver_path), options=options)
+        prefs = {'intl.accept_languages': 'en,en_US'}
+        if settings['block_resources']:  # Images of every tab, the uploaded files are not affected.
+            prefs['profile.managed_default_content_settings.images'] = 2
+            options.add_argument('--autoplay-policy=user-gesture-required')
+        options.add_experimental_option('prefs', prefs)
+
+        # DeprecationWarning using executable_path. Without the assets driver Selenium finds one.
+        service = Service(self.webdriver_path) if os.path.isfile(self.webdriver_path) else Service()
+        driver = webdriver.Chrome(service=service, options=options)
         # driver.maximize_window() # Maximize window to reach all elements.
 
+        # Same tabs as the extension: the wallet in the first one, OpenSea in the second.
+        if settings['wallet_url']:
+            driver.get(self.wallet_url)
+            driver.switch_to.new_window('tab')
+
+        # Block the media and the analytics hosts in the OpenSea tab.
+        if settings['block_resources']:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(blocked_urls)})
+
         return driver
 
+    """ Restart
+    * Replaces the browser by a new one
+    """
+    def restart(self) -> None:
+        try:
+            self.driver.quit()
+        except Exception:  # The browser already crashed.
+            pass
+        self.tabs, self.tab = [], None
+        self.elements.clear()
+        self.driver = self.webdriver()
+
+    """ New tab
+    * Opens a new tab with the same blocked URLs
+    @Returns: The tab handle
+    """
+    def new_tab(self) -> str:
+        self.driver.switch_to.new_window('tab')
+        if settings['block_resources']:  # The blocked URLs are set by tab.
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(blocked_urls)})
+        return self.driver.current_window_handle
+
+    """ Base windows
+    * Counts the wallet and the OpenSea tabs, the other windows are wallet pop ups
+    @Returns: The number of windows without pop up
+    """
+    def base_windows(self) -> int:
+        return 1 + max(len(self.tabs), 1)
+
+    """ Get
+    * Loads a page
+    @Params:
+    - url: The page URL
+    """
+    @timed
+    def get(self, url: str) -> None:
+        self.elements.clear()  # Elements of the previous page.
+        self.driver.get(url)
+
+    """ Cached
+    * Gets the element found for a selector since the last page load
+    @Params:
+    - element: The selector
+    - strategy: present, or visible for a displayed element only
+    @Returns: The element, None if it is not cached, stale or hidden
+    """
+    def cached(self, element: str, strategy: str = 'present'):
+        found = self.elements.get(element)
+        if found is None:
+            return None
+
+        try:
+            if strategy == 'present':
+                found.is_enabled()  # Fails if the element left the page.
+            elif not found.is_displayed():
+                return None
+        except WebDriverException:  # Stale, the page changed.
+            self.elements.pop(element, None)
+            return None
+
+        self.registry.count(element, 'hits')
+        return found
+
+    """ Find
+    * Finds the elements of a selector and caches the first one
+    @Params:
+    - element: The selector
+    @Returns: The elements found
+    """
+    def find(self, element: str) -> list:
+        found = self.driver.find_elements(*self.registry.locate(element))
+        if found:
+            self.elements[element] = found[0]
+        return found
+
+    """ Until
+    * Polls a condition until it is true
+    @Params:
+    - condition: Function of the driver returning a truthy value when ready
+    - timeout: The maximum seconds to wait, the default timeout if None
+    @Returns: The value returned by the condition
+    """
+    def until(self, condition, timeout: float = None):
+        return WDW(self.driver, timeout or self.timeout, poll_frequency=self.poll).until(condition)
+
+    """ Wait
+    * Waits for an element with a strategy
+    @Params:
+    - element: The XPath of the element
+    - strategy: present, visible or interactable (visible, or present
+      for longer than the JavaScript fallback delay)
+    - timeout: The maximum seconds to wait, the default timeout if None
+    @Returns: The web element
+    """
+    def wait(self, element: str, strategy: str = 'visible', timeout: float = None):
+        found = self.cached(element, 'present' if strategy == 'present' else 'visible')
+        if found is not None:
+            return found
+
+        self.registry.count(element, 'misses')
+        start = time.monotonic()
+
+        def ready(driver):
+            try:
+                found = self.find(element)
+                if not found:
+                    return False
+                if strategy == 'present' or found[0].is_displayed():
+                    return found[0]
+                if strategy == 'interactable' and time.monotonic() - start >= self.js_fallback:
+                    return found[0]  # Some elements are not visible but are present.
+            except WebDriverException:  # Stale element, the page changed.
+                pass
+            return False
+
+        try:
+            return self.until(ready, timeout)
+        except TE:
+            self.registry.count(element, 'timeouts')
+            raise
+
     """ Clickable
     * Checks for element interaction
     @Params:
     - element: The element to click
+    - timeout: The maximum seconds to wait, the default timeout if None
     """
-    def clickable(self, element: str) -> None:
-        try:
-            WDW(self.driver, 10).until(EC.element_to_be_clickable((By.XPATH, element))).click()
+    @timed
+    def clickable(self, element: str, timeout: float = None) -> None:
+        # Known to need JavaScript, don't wait for it to be clickable.
+        if element in self.js_clickable:
+            self.driver.execute_script('arguments[0].click();', self.wait(element, 'present', timeout))
+            return
+
+        found = self.cached(element, 'visible')
+        if found is not None:
+            try:
+                if found.is_enabled():
+                    found.click()
+                    return
+            except WebDriverException:  # Covered or stale, found again.
+                self.elements.pop(element, None)
+
+        self.registry.count(element, 'misses')
+        start = time.monotonic()
+
+        def click(driver):
+            found = []
+            try:
+                found = self.find(element)
+                if not found:
+                    return False
+                if found[0].is_displayed() and found[0].is_enabled():
+                    found[0].click()
+                    return True
+            except WebDriverException:  # Covered, not interactable or stale.
+                pass
+
+            # Some buttons need to be visible to be clickable, JavaScript can bypass this.
+            if found and time.monotonic() - start >= self.js_fallback:
+                driver.execute_script('arguments[0].click();', found[0])
+                self.js_clickable.add(element)
+                return True
+            return False
 
-        except Exception: # Some buttons need to be visible to be clickable, JavaScript can bypass this.
-            self.driver.execute_script('arguments[0].click();', self.visible(element))
+        try:
+            self.until(click, timeout)
+        except TE:
+            self.registry.count(element, 'timeouts')
+            raise
 
     """ Visible
     * Checks the visibility of an element
     @Params:
     - element: The element to click
+    - timeout: The maximum seconds to wait, the default timeout if None
     """
-    def visible(self, element: str):
-        return WDW(self.driver, 10).until(EC.visibility_of_element_located((By.XPATH, element)))
+    @timed
+    def visible(self, element: str, timeout: float = None):
+        return self.wait(element, 'visible', timeout)
 
     """ Send keys
     * Send key input to elements
@@ -463,12 +2410,47 @@ class Webdriver:
     - element: The element to send values to
     - keys: The input to send to the element
     """
+    @timed
     def send_keys(self, element: str, keys: str) -> None:
+        self.wait(element, 'interactable').send_keys(keys)
+
+    """ Fill rows
+    * Adds the rows of a dialog table and sets all their values with one script
+    @Params:
+    - table: The XPath of the table body
+    - button: The selector of the "Add more" button
+    - rows: The values of every row, by column
+    @Returns: The number of rows of the table and whether every value is set
+    """
+    @timed
+    def fill_rows(self, table: str, button: str, rows: list) -> tuple:
+        rows = [[str(value) for value in row] for row in rows]
+        try:
+            found = self.driver.execute_async_script(self.fill_rows_script, self.registry.locate(table),
+                                                     self.registry.locate(button), rows)
+        except WebDriverException:  # Script timeout, or the inputs are not where expected.
+            found = None
+
+        if not found:  # Some rows may have been added.
+            return max(len(self.driver.find_elements(By.XPATH, f'{table}/tr')), 1), False
+        return len(found), len(found) >= len(rows) and all(values[:len(row)] == row for values, row in zip(found, rows))
+
+    """ Fill values
+    * Sets the values of text inputs and textareas with one script
+    @Params:
+    - values: The selector of every element and its value
+    @Returns: The elements whose value is not set
+    """
+    @timed
+    def fill_values(self, values: dict) -> list:
+        fields = [[self.registry.locate(element), str(value)] for element, value in values.items()]
         try:
-            self.visible(element).send_keys(keys)
+            found = self.driver.execute_async_script(self.fill_values_script, fields)
+        except WebDriverException:  # Script timeout or JavaScript error.
+            found = None
 
-        except Exception: # Some elements are not visible but are present.
-            WDW(self.driver, 5).until(EC.presence_of_element_located((By.XPATH, element))).send_keys(keys)
+        found = found or [None] * len(fields)
+        return [element for element, (_, value), read in zip(values, fields, found) if read != value]
 
     """ Send date
     * Send a date (DD-MM-YYYY HH:MM) to a date input by clicking on it.
@@ -476,6 +2458,7 @@ class Webdriver:
     - element: The element to send a date to
     - keys: The input to send to the element
     """
+    @timed
     def send_date(self, element: str, keys: str) -> None:
         keys = keys.split('-') if '-' in keys else [keys]
         keys = [keys[1], keys[0], keys[2]] if len(keys) > 1 else keys
@@ -486,6 +2469,21 @@ class Webdriver:
             self.clickable(element)
             self.send_keys(element, keys[part])
 
+    """ Is empty
+    * Checks if the dictionary is empty
+    @Params:
+    - element: The string value of the NFT
+    - data: The data value fo the NFT
+    - value: The value of the NFT
+    @Returns: Whether or not it was successful
+    """
+    def is_empty(self, element: str, data: str, value: str = '') -> bool:
+        if data != value:
+            self.send_keys(element, data)
+            return False
+
+        return True
+
     """ Clear element
     * Clears the values of the element
     @Params:
@@ -503,11 +2501,22 @@ class Webdriver:
     """ Window handles
     * Checks and waits for specifit tabs
     @Params:
-    - window_number: The window to move to
+    - window_number: The window to move to, 1 is the current OpenSea tab
+      and the next ones are the pop ups with several OpenSea tabs
     """
+    @timed
     def window_handles(self, window_number: int) -> None:
-        WDW(self.driver, 30).until(lambda _: len(self.driver.window_handles) > window_number)
-        self.driver.switch_to.window(self.driver.window_handles[window_number])
+        self.elements.clear()  # Elements of another window.
+        if not self.tabs:
+            self.until(lambda _: len(self.driver.window_handles) > window_number, 30)
+            self.driver.switch_to.window(self.driver.window_handles[window_number])
+        elif window_number == 1:
+            self.driver.switch_to.window(self.tab)
+        else:  # The wallet tab or a pop up, the windows that are not OpenSea tabs.
+            index = max(window_number - 1, 0)
+            others = lambda: [handle for handle in self.driver.window_handles if handle not in self.tabs]
+            self.until(lambda _: len(others()) > index, 30)
+            self.driver.switch_to.window(others()[index])
 
 
 """ OpenSea
@@ -520,205 +2529,249 @@ class OpenSea:
     - wallet: The wallet choice.
     - password: The wallet password
     - recovery_phrase: The wallet recovery phrase
+    - web: The webdriver of this session
+    - structure: The NFT data of this session
+    - reader: The reader of the data file
+    - retry: The retry policy shared by the workers, a new one if None
     """
-    def __init__(self, wallet: int, password: str, recovery_phrase: str) -> None:
+    def __init__(self, wallet: int, password: str, recovery_phrase: str, web: 'Webdriver',
+                 structure: Structure, reader: Reader, retry: 'RetryPolicy' = None) -> None:
         # Store the credentials
         self.recovery_phrase = recovery_phrase  
         self.password = password
+        self.wallet = wallet
+
+        # Store the session state
+        self.web = web
+        self.structure = structure
+        self.reader = reader
+        self.retry = retry or RetryPolicy()
+        self.pipeline = None  # Tab pipeline of the uploads, set by the pipeline.
 
         # Store URLs
-        self.login_url = 'https://opensea.io/login?referrer=%2Fasset%2Fcreate'
-        self.create_url = 'https://opensea.io/asset/create'
+        opensea_url = settings['opensea_url'].rstrip('/')
+        self.login_url = f'{opensea_url}/login?referrer=%2Fasset%2Fcreate'
+        self.create_url = f'{opensea_url}/asset/create'
 
     """ Wallet login
     * Log into the user chosen wallet
     """
+    @flow('login')
     def wallet_login(self) -> None:
-        if wallet == 0: self.coinbase_login()
+        if self.web.profile and self.wallet_session():
+            print(f'{green}Wallet restored from the profile.')
+            return
+
+        if self.wallet == 0: self.coinbase_login()
         else: self.metamask_login()
 
+    """ Wallet session
+    * Checks if the wallet of the persistent profile is already imported
+    * and unlocks it with the password
+    @Returns: Whether the recovery phrase import can be skipped
+    """
+    def wallet_session(self) -> bool:
+        # An imported wallet doesn't open its welcome tab, open it in the first tab.
+        try:
+            self.web.until(lambda _: len(self.web.driver.window_handles) > 1, 3)
+        except TE:
+            self.web.driver.switch_to.new_window('tab')
+
+        self.web.window_handles(0)  # Switch to the wallet tab.
+        self.web.get(self.web.wallet_url)
+
+        # The welcome page is shown until the recovery phrase is imported.
+        welcome = ('//*[@data-testid="btn-import-existing-wallet"]', '//*[@class="welcome-page"]')[self.wallet == 1]
+        try:
+            self.web.wait(welcome, 'present', 5)
+            return False
+        except TE:
+            pass
+
+        try:  # Unlock the wallet if it is locked.
+            self.web.visible('//input[@type="password"]', 3).send_keys(self.password + Keys.ENTER)
+        except TE:  # Already unlocked.
+            pass
+
+        return True
+
     """ Coinbase login
     * Log into the Coinbase wallet
     """
+    @retried('coinbase_login')
     def coinbase_login(self) -> None:
-        try: 
-            print('\nLogin to Coinbase.', end=' ')
-            web.window_handles(0) # Switch to the Coinbase extension tab.
-            web.driver.refresh() # Reload the page to prevent a blank page.
-            web.clickable('//*[@data-testid="btn-import-existing-wallet"]') # Click on the "I have a wallet" button.
-            web.clickable('//*[@data-testid="btn-import-recovery-phrase"]') # Click on the "Enter recover phrase" button.
-            web.send_keys('//*[@data-testid="seed-phrase-input"]', self.recovery_phrase) # Input the recovery phase
-            web.clickable('//*[@data-testid="btn-import-wallet"]') # Click on "Import wallet" button
-            web.send_keys('//*[@data-testid="setPassword"]', self.password) # Set password
-            web.send_keys('//*[@data-testid="setPasswordVerify"]', self.password) # Verify password
-            web.clickable('//*[@data-testid="terms-and-privacy-policy-parent"]') # Agree to terms and conditions
-            web.clickable('//*[@data-testid="btn-password-continue"]') # Click on the "Submit" button
-
-        except Exception: # Failed - a web element is not accessible.
-            print(f'{red}Login to Coinbase failed, retrying...')
-            self.coinbase_login()
+        print('\nLogin to Coinbase.', end=' ')
+        self.web.window_handles(0) # Switch to the Coinbase extension tab.
+        self.web.driver.refresh() # Reload the page to prevent a blank page.
+        self.web.clickable('//*[@data-testid="btn-import-existing-wallet"]') # Click on the "I have a wallet" button.
+        self.web.clickable('//*[@data-testid="btn-import-recovery-phrase"]') # Click on the "Enter recover phrase" button.
+        self.web.send_keys('//*[@data-testid="seed-phrase-input"]', self.recovery_phrase) # Input the recovery phase
+        self.web.clickable('//*[@data-testid="btn-import-wallet"]') # Click on "Import wallet" button
+        self.web.send_keys('//*[@data-testid="setPassword"]', self.password) # Set password
+        self.web.send_keys('//*[@data-testid="setPasswordVerify"]', self.password) # Verify password
+        self.web.clickable('//*[@data-testid="terms-and-privacy-policy-parent"]') # Agree to terms and conditions
+        self.web.clickable('//*[@data-testid="btn-password-continue"]') # Click on the "Submit" button
 
     """ MetaMask login
     * Log into the MetaMask wallet
     """
+    @retried('metamask_login')
     def metamask_login(self) -> None:
-        try: 
-            print('Login to MetaMask.', end=' ')
-            web.window_handles(0)  # Switch to the MetaMask extension tab.
-            web.driver.refresh()  # Reload the page to prevent a blank page.
-            web.clickable('//*[@class="welcome-page"]/button') # Click on the "Start" button.
-            web.clickable('//*[contains(@class, "btn-primary")][position()=1]') # Click on the "Import wallet" button.
-            web.clickable('//footer/button[2]') # Click on the "I agree" button.
-            web.send_keys('//input[position()=1]', self.recovery_phrase) # Input the recovery phrase.
-
-            # Input a new password or the same password of your account.
-            web.send_keys('//*[@id="password"]', self.password)
-            web.send_keys('//*[@id="confirm-password"]', self.password)
+        print('Login to MetaMask.', end=' ')
+        self.web.window_handles(0)  # Switch to the MetaMask extension tab.
+        self.web.driver.refresh()  # Reload the page to prevent a blank page.
+        self.web.clickable('//*[@class="welcome-page"]/button') # Click on the "Start" button.
+        self.web.clickable('//*[contains(@class, "btn-primary")][position()=1]') # Click on the "Import wallet" button.
+        self.web.clickable('//footer/button[2]') # Click on the "I agree" button.
+        self.web.send_keys('//input[position()=1]', self.recovery_phrase) # Input the recovery phrase.
 
-            web.clickable('(//*[@role="checkbox"])[2]') # Click on the "I have read and agree to the..." checkbox.
-            web.clickable('//*[contains(@class, "btn-primary")][position()=1]') # Click on the "Import" button.
+        # Input a new password or the same password of your account.
+        self.web.send_keys('//*[@id="password"]', self.password)
+        self.web.send_keys('//*[@id="confirm-password"]', self.password)
 
-            # Wait until the login worked and click on the "All done" button".
-            web.visible('//*[contains(@class, "emoji")][position()=1]')
-            web.clickable('//*[contains(@class, "btn-primary")][position()=1]')
+        self.web.clickable('(//*[@role="checkbox"])[2]') # Click on the "I have read and agree to the..." checkbox.
+        self.web.clickable('//*[contains(@class, "btn-primary")][position()=1]') # Click on the "Import" button.
 
-            print(f'{green}Logged to MetaMask.')
+        # Wait until the login worked and click on the "All done" button".
+        self.web.visible('//*[contains(@class, "emoji")][position()=1]')
+        self.web.clickable('//*[contains(@class, "btn-primary")][position()=1]')
 
-        except Exception: # Failed - a web element is not accessible.
-            print(f'{red}Login to MetaMask failed, retrying...')
-            self.metamask_login()
+        print(f'{green}Logged to MetaMask.')
 
     """ Sign contract
     * Forwards to the selected wallet contract signing.
+    @Params:
+    - nft: The NFT being listed, None when logging in
     """
-    def sign_contract(self) -> None:
-        if wallet == 0: self.coinbase_contract()
-        else: self.metamask_contract()
+    def sign_contract(self, nft: NFTRecord = None) -> None:
+        if self.wallet == 0: self.coinbase_contract()
+        else: self.metamask_contract(nft)
 
     """ Coinbase contract
-    * Go through the Coinbase contract flow
+    * Go through the Coinbase contract flow, the errors are retried by the OpenSea login or the sale
     """
     def coinbase_contract(self) -> None:
-        web.window_handles(2) # Switch to the Coinbase pop up tab.
-        web.clickable('//*[@data-testid="sign-message"]') # Click on the "Sign" button - Make a contract link.
-
-        try: # Wait until the Coinbase pop up is closed.
-            WDW(web.driver, 10).until(EC.number_of_windows_to_be(2))
-
-        except TE: # Sign the contract a second time.
-            self.coinbase_contract()  
-
-        web.window_handles(1) # Switch back to the OpenSea tab.
+        self.web.window_handles(2) # Switch to the Coinbase pop up tab.
+        self.web.clickable('//*[@data-testid="sign-message"]') # Click on the "Sign" button - Make a contract link.
+        self.web.until(lambda driver: len(driver.window_handles) == self.web.base_windows())  # Signed again if the pop up is not closed.
+        self.web.window_handles(1) # Switch back to the OpenSea tab.
 
     """ MetaMask contract
-    * Go through the MetaMask contract flow
+    * Go through the MetaMask contract flow, the errors are retried by the OpenSea login or the sale
+    @Params:
+    - nft: The NFT being listed, None when logging in
     """
-    def metamask_contract(self) -> None:
-        if structure.blockchain == 'Polygon':
-            web.clickable('//div[@data-testid="Panel"][last()]/div/div/div/div/button')
-
-        web.window_handles(2) # Switch to the MetaMask pop up tab.
-        web.clickable('//*[contains(@class, "button btn-secondary")]') # Click on the "Sign" button - Make a contract link.
-
-        try: # Wait until the MetaMask pop up is closed.
-            WDW(web.driver, 10).until(EC.number_of_windows_to_be(2))
-
-        except TE: # Sign the contract a second time.
-            self.metamask_contract()  
+    def metamask_contract(self, nft: NFTRecord = None) -> None:
+        # The Polygon button is only clicked once, the pop up stays open when signing fails.
+        if nft is not None and nft.blockchain == 'Polygon' and \
+                len(self.web.driver.window_handles) <= self.web.base_windows():
+            self.web.clickable('//div[@data-testid="Panel"][last()]/div/div/div/div/button')
 
-        web.window_handles(1) # Switch back to the OpenSea tab.
+        self.web.window_handles(2) # Switch to the MetaMask pop up tab.
+        self.web.clickable('//*[contains(@class, "button btn-secondary")]') # Click on the "Sign" button - Make a contract link.
+        self.web.until(lambda driver: len(driver.window_handles) == self.web.base_windows())  # Signed again if the pop up is not closed.
+        self.web.window_handles(1) # Switch back to the OpenSea tab.
 
     """ Start coin wallet
-    * Start the Coinbase wallet flow
+    * Start the Coinbase wallet flow, the errors are retried by the OpenSea login
     """
     def start_coin_wallet(self) -> None:
-        try:
-            web.clickable('//*[contains(text(), "Coinbase Wallet")]/../..')
-            web.window_handles(2) # Switch to the new pop-up tab
-            web.clickable('//*[@data-testid="allow-authorize-button"]') # Click on the "Connect" button.
-            web.window_handles(3) # Switch to the new Wallet pop up tab.
-            web.clickable('//*[@data-testid="sign-message"]') # Cick on the "Sign" button.
-
-        except Exception:  #Could not start the wallet
-            print(f'{red}Starting the Coinbase wallet failed. Retrying.')
-            web.window_handles(1)  # Switch to the main (data:,) tab.
-            web.driver.refresh()  # Reload the page (is the login failed?).
-            self.opensea_login()  # Retry everything.
+        self.web.clickable('//*[contains(text(), "Coinbase Wallet")]/../..')
+        self.web.window_handles(2) # Switch to the new pop-up tab
+        self.web.clickable('//*[@data-testid="allow-authorize-button"]') # Click on the "Connect" button.
+        self.web.window_handles(3) # Switch to the new Wallet pop up tab.
+        self.web.clickable('//*[@data-testid="sign-message"]') # Cick on the "Sign" button.
 
     """ Start meta wallet
-    * Start the MetaMask wallet flow
+    * Start the MetaMask wallet flow, the errors are retried by the OpenSea login
     """ 
     def start_meta_wallet(self) -> None:
-        try:
-            web.clickable('//*[contains(text(), "MetaMask")]/../..') # Click on the "MetaMask" button in list of wallets.
-            web.window_handles(2) # Switch to the new pop-up tab
-            web.clickable('//*[@class="button btn-primary"]') # Click on the "Next" button.
-            web.clickable('//*[contains(@class, "button btn-primary")]') # Click on the "Connect" button.
-            web.window_handles(2)  # Switch to the MetaMask pop up tab.
-            self.metamask_contract()  # Sign the contract.
-
-        except Exception:
-            print(f'{red}Starting the wallet failed. Retrying.')
-            web.window_handles(1)  # Switch to the main (data:,) tab.
-            web.driver.refresh()  # Reload the page (is the login failed?).
-            self.opensea_login()  # Retry everything.
+        self.web.clickable('//*[contains(text(), "MetaMask")]/../..') # Click on the "MetaMask" button in list of wallets.
+        self.web.window_handles(2) # Switch to the new pop-up tab
+        self.web.clickable('//*[@class="button btn-primary"]') # Click on the "Next" button.
+        self.web.clickable('//*[contains(@class, "button btn-primary")]') # Click on the "Connect" button.
+        self.web.window_handles(2)  # Switch to the MetaMask pop up tab.
+        self.metamask_contract()  # Sign the contract.
 
     """ OpenSea login
     * Log in to OpenSea flow
     """
+    @flow('login')
+    @retried('opensea_login')
     def opensea_login(self) -> None:
+        if self.web.profile and self.opensea_session():
+            print(f'{green}Logged to OpenSea (session restored).\n')
+            return
+
         try:  # Try to login to the OpenSea using MetaMask.
             print('Login to OpenSea.', end=' ')
 
-            web.window_handles(1)  # Switch to the main (data:,) tab.
-            web.driver.get(self.login_url)  # Go to the OpenSea login URL.
-            web.clickable('//button[contains(@class, "show-more")]') # Click on the "Show more options" button.
+            self.web.window_handles(1)  # Switch to the main (data:,) tab.
+            self.web.get(self.login_url)  # Go to the OpenSea login URL.
+            self.web.clickable('//button[contains(@class, "show-more")]') # Click on the "Show more options" button.
 
             # Login to the wallet
-            if wallet == 0: self.start_coin_wallet()
+            if self.wallet == 0: self.start_coin_wallet()
             else: self.start_meta_wallet()
 
             # Check if the login worked.
-            web.window_handles(1)  # Switch back to the OpenSea tab.
-            WDW(web.driver, 15).until(EC.url_to_be(self.create_url))
+            self.web.window_handles(1)  # Switch back to the OpenSea tab.
+            self.web.until(EC.url_to_be(self.create_url), 15)
 
-            print(f'{green}Logged to OpenSea.\n')
+        except Exception:  # The contract failed, the whole login is retried if this fails too.
+            self.web.window_handles(1)  # Switch back to the OpenSea tab.
+            self.web.window_handles(2)  # Switch to the MetaMask pop up tab.
+            self.sign_contract()  # Sign the contract.
 
-        except Exception:  # The contract failed.
-            try:
-                web.window_handles(1)  # Switch back to the OpenSea tab.
-                web.window_handles(2)  # Switch to the MetaMask pop up tab.
-                self.sign_contract()  # Sign the contract.
+            # Check if the login worked.
+            self.web.until(EC.url_to_be(self.create_url), 15)
 
-                # Check if the login worked.
-                WDW(web.driver, 15).until(EC.url_to_be(self.create_url))
+        print(f'{green}Logged to OpenSea.\n')
 
-                print(f'{green}Logged to OpenSea.\n')
+    """ Restart
+    * Replaces a failing browser session by a new logged in one
+    @Returns: Whether the browser restarted, not while uploads are pending in other tabs
+    """
+    def restart(self) -> bool:
+        if self.pipeline is not None and self.pipeline.pending:  # Their NFTs would be minted again.
+            print(f'{yellow}Uploads are pending in other tabs, the browser restarts later.')
+            return False
 
-            except Exception:
-                print(f'{red}Login to OpenSea failed. Retrying.')
+        print(f'{yellow}Restarting the browser session.')
+        self.web.restart()
+        self.wallet_login()
+        self.opensea_login()
+        return True
 
-                web.window_handles(1)  # Switch back to the OpenSea tab.
-                web.driver.refresh()  # Reload the page (is the login failed?).
-                self.opensea_login()  # Retry everything.
+    """ OpenSea session
+    * Checks if the OpenSea session of the persistent profile is still valid
+    @Returns: Whether the create page opens without logging in
+    """
+    def opensea_session(self) -> bool:
+        self.web.window_handles(1)  # Switch to the main tab.
+        self.web.get(self.create_url)
+
+        try:  # A logged out session is redirected to the login page.
+            self.web.wait('name', 'present')
+            return self.web.driver.current_url.startswith(self.create_url)
+        except TE:
+            return False
 
     """ Check for captcha
     * Check to see if a captcha shows.
     * Most likely will and you have to solve it manually.
     """
     def check_for_captcha(self) -> None:
-        if web.visible('//h4[contains(text(), "Almost done")]'): # Check to wait for captcha
+        if self.web.visible('captcha'): # Check to wait for captcha
 
             try: # Look for the captcha ifrmae and switch to it
-                time.sleep(1)
-                iframes = web.driver.find_elements(by=By.TAG_NAME, value="iframe")
-                web.driver.switch_to.frame(iframes[0])
+                self.web.until(EC.frame_to_be_available_and_switch_to_it((By.TAG_NAME, 'iframe')))
                 
             except Exception:
                 print('| Could not find the captcha iframe')
 
             try: # Try to click the anchor
-                web.clickable('//*[@id="recaptcha-anchor"]/div[1]')
+                self.web.clickable('captcha_anchor')
 
             except Exception:
                 print('| Could not find the anchor')
@@ -731,443 +2784,444 @@ class OpenSea:
     """ OpenSea upload
     * Uploads the nft to OpenSea
     @Params:
-    - number: The item index to upload
+    - nft: The NFT to upload
     @Returns: Whether the upload was successful or not
     """
-    def opensea_upload(self, number: int) -> bool:
-        print(f'\nUploading NFT n°{number}/{reader.lenght_file}. -{structure.nft_name}')
+    @flow('upload')
+    def opensea_upload(self, nft: NFTRecord) -> bool:
+        print(f'\nUploading NFT n°{nft.number}/{self.reader.lenght_file or "?"}. -{nft.nft_name}')
 
-        try:  
-            # Go to the OpenSea create URL and input all datas of the NFT.
-            web.driver.get(self.create_url + '?enable_supply=true')
+        try:
+            self.opensea_create(nft)
+
+            # Verify upload
+            self.web.until(lambda _: self.opensea_created(), 2400)
+            self.opensea_uploaded(nft)
 
-            # Upload NFT File
-            # -------------------------------
+            return True  # If it perfectly worked.
+        except Exception as error:  # An element is not reachable.
+            print(f'{red}An error occured. {error}')
+            self.structure.failed.append(nft.nft_name)
+            return False  # If it failed.
 
-            # Check for a preview
-            if isinstance(structure.file_path, list): 
-                if len(structure.file_path) == 2:
-                    file_path = os.path.abspath(structure.file_path[0])
-                    preview = os.path.abspath(structure.file_path[1])
-            
-            else: # No preview file.
-                file_path = os.path.abspath(structure.file_path)
-
-            # Check if the file exists
-            if not os.path.exists(file_path):
-                raise TE('File doesn\'t exist or path is incorrect.')
-
-            # File size
-            if os.path.getsize(file_path) / (1024 ** 2) > 100:
-                raise TE('File size must be less than 100 MegaBytes.')
-
-            # Check the file
-            if os.path.splitext(file_path)[1][1:].lower() not in \
-                ('jpg', 'jpeg', 'png', 'gif', 'svg', 'mp4', 'webm', 'mp3', 'wav', 'ogg', 'glb', 'gltf'):
-                raise TE('The file extension is not supported on OpenSea.')
-
-            # Try pyautogui first
-            try: 
-                import pyautogui
-
-                # Click the image button
-                image_element = '//div[contains(@class, "FileInputreact__Container-sc-u4tlig-3")]'
-                web.clickable(image_element)
-                # found_element = WDW(web.driver, 10).until(EC.presence_of_element_located((By.XPATH, image_element)))
-                # found_element.click()
-
-                # Run through selecting the image
-                pyautogui.write(file_path)
-                pyautogui.press('enter')
-                pyautogui.press('enter')
-
-            except: # Fallback upload for history
-                image_element = '//*[@id="media"]'
-                WDW(web.driver, 10).until(EC.presence_of_element_located((By.XPATH, image_element))).send_keys(file_path)
-
-            # Check for media
-            if os.path.splitext(file_path)[1][1:].lower() in \
-                    ('mp4', 'webm', 'mp3', 'wav', 'ogg', 'glb', 'gltf'):
-                # Upload the NFT file.
-                if not os.path.exists(preview):  
-                    raise TE('File doesn\'t exist or path is incorrect.')
-                if os.path.getsize(preview) / (1024 ** 2) > 100:
-                    raise TE('File size must be less than 100 MegaBytes.')
-
-                structure.is_empty('//input[@name="preview"]', preview)
-
-            # Input NFT name.
-            if structure.is_empty('//*[@id="name"]', structure.nft_name):
-                raise TE('The NFT name is missing.')
-
-            # Input external link.
-            structure.is_empty('//*[@id="external_link"]', structure.link)
-
-            # Input description.
-            structure.is_empty('//*[@id="description"]', structure.description)
-
-            # Input collection and select it.
-            if not structure.is_empty(  
-                    '//form/div[5]/div/div[2]/input', structure.collection):
-                try:  # Try to click on the collection button.
-                    collection = ('//span[contains(text(), "'
-                                  f'{structure.collection}")]/../..')
-                    web.visible(collection)  # Check that the collection span
-                    web.clickable(collection)  # is visible and click on it.
-                except Exception:  # If collection doesn't exist.
-                    raise TE('Collection doesn\'t exist or can\'t be found.')
-            datas = [structure.properties, structure.levels, structure.stats]
-            for index in range(len(datas)):  # Add properties, levels & stats.
-                if not len(datas[index]) > 0:  # Check if data is not empty.
-                    continue  # Pass this data because it's empty or null.
-                # Change element from a list of strings to a list of lists.
-                if not isinstance(datas[index][0], list):
-                    datas[index] = [datas[index]]  # Target maybe useless.
-                web.clickable(  # Click on "+" button to open the pop up.
-                    f'//form/section/div[{index + 1}]/div/div[2]/button')
+    """ OpenSea create
+    * Fills the create form of the NFT and submits it
+    @Params:
+    - nft: The NFT to upload
+    """
+    @flow('create')
+    def opensea_create(self, nft: NFTRecord) -> None:
+        # Go to the OpenSea create URL and input all datas of the NFT.
+        self.web.get(self.create_url + '?enable_supply=true')
+
+        # Upload NFT File
+        # -------------------------------
+
+        # Check the file and its preview.
+        file_path, preview = nft.media()
+        file_path = self.structure.optimized.get(file_path, file_path)  # Smaller copy.
+
+        # Try pyautogui first
+        try: 
+            # The native file dialog can't be shared between parallel sessions.
+            if settings['workers'] > 1 or settings['tabs'] > 1 or settings['driver_factory'] is not None:
+                raise ImportError('pyautogui is not used with parallel workers, tabs or another browser.')
+
+            import pyautogui
+
+            # Click the image button
+            image_element = 'media_button'
+            self.web.clickable(image_element)
+
+            # Run through selecting the image
+            pyautogui.write(file_path)
+            pyautogui.press('enter')
+            pyautogui.press('enter')
+
+        except: # Fallback upload for history
+            image_element = 'media'
+            self.web.wait(image_element, 'present').send_keys(file_path)
+
+        # Upload the preview of audio, video and 3D files.
+        if preview:
+            self.web.is_empty('preview', preview)
+
+        # Input NFT name, external link and description, set with the
+        # unlockable content in fast fill mode.
+        if nft.nft_name == '':
+            raise TE('The NFT name is missing.')
+        texts = {'name': nft.nft_name, 'external_link': nft.link, 'description': nft.description}
+        if not settings['fast_fill']:
+            self.fill_texts(texts)
+
+        # Input collection and select it.
+        if not self.web.is_empty(  
+                '//form/div[5]/div/div[2]/input', nft.collection):
+            try:  # Try to click on the collection button.
+                collection = ('//span[contains(text(), "'
+                              f'{nft.collection}")]/../..')
+                self.web.visible(collection)  # Check that the collection span
+                self.web.clickable(collection)  # is visible and click on it.
+            except Exception:  # If collection doesn't exist.
+                raise TE('Collection doesn\'t exist or can\'t be found.')
+        datas = [nft.properties, nft.levels, nft.stats]
+        for index in range(len(datas)):  # Add properties, levels & stats.
+            if not len(datas[index]) > 0:  # Check if data is not empty.
+                continue  # Pass this data because it's empty or null.
+            # Change element from a list of strings to a list of lists.
+            if not isinstance(datas[index][0], list):
+                datas[index] = [datas[index]]  # Target maybe useless.
+            self.web.clickable(  # Click on "+" button to open the pop up.
+                f'//form/section/div[{index + 1}]/div/div[2]/button')
+            table = f'/html/body/div[{index + 2}]/div/div/div/section/table/tbody'
+            rows, filled = 1, False  # A new pop up has one empty row.
+            if settings['bulk_traits']:  # All the rows at once.
+                rows, filled = self.web.fill_rows(table, 'trait_add', datas[index])
+            if not filled:  # Typed cell by cell, over the values of the script.
                 number_ = 0
                 for data in datas[index]:
-                    if number_ > 0:  # If there are more than 1 element.
+                    if number_ >= rows:  # If there are more elements than rows.
                         # Click on "Add more" button.
-                        web.clickable('//div[@role="dialog"]/section/button')
+                        self.web.clickable('trait_add')
                     number_ += 1  # Increase number to add more element.
-                    web.send_keys(  # Input values in the inputs.
-                        f'/html/body/div[{index + 2}]/div/div/div/section/tabl'
-                        f'e/tbody/tr[{number_}]/td[1]/div/div/input', data[0])
+                    name_element = f'{table}/tr[{number_}]/td[1]/div/div/input'
+                    if settings['bulk_traits']:
+                        self.web.clear_text(name_element)  # Value of the script.
+                    self.web.send_keys(name_element, data[0])  # Input values in the inputs.
                     for rank in [3, 2]:  # Input third and second values.
                         if len(data) == 3 or rank == 2:  # 1 or 2 loops.
-                            actual_element = f'/html/body/div[{index + 2}]' + \
-                                '/div/div/div/section/table/tbody/' + \
-                                f'tr[{number_}]/td[{rank}]/div/div/input'
-                            web.clear_text(actual_element)  # Default text.
-                            web.send_keys(actual_element, data[rank - 1])
-                web.clickable('//footer/button')  # Click on the "Save" button.
-            # Click on the "Unlockable Content" switch if it's true.
-            if isinstance(structure.unlockable_content, list):  # If not False.
-                if len(structure.unlockable_content) > 0:  # Not an empty list.
-                    if isinstance(structure.unlockable_content[0], bool):
-                        if structure.unlockable_content[0]:  # If True.
-                            web.send_keys('//*[@id="unlockable-content-toggle'
-                                          '"]', Keys.ENTER)  # Toggle button.
-                            web.send_keys(  # Input the unlockable content.
-                                '//div[contains(@class, "unlockable")]/'
-                                'textarea', structure.unlockable_content[1])
-            # Click on the "Explicit & Sensitive Content" switch if it's true.
-            if structure.explicit_and_sensitive_content != '':  # Not empty.
-                if isinstance(structure.explicit_and_sensitive_content, bool):
-                    if structure.explicit_and_sensitive_content:  # True.
-                        web.send_keys('//*[@id="explicit-content-toggle"]',
-                                      Keys.ENTER)  # Toggle button.
-            # Set number of supplies if it's not an empty string.
-            if structure.supply != '' and 'supply=' in web.driver.current_url:
-                if isinstance(structure.supply, int):  # Integer.
-                    if structure.supply > 1:  # Set supplies deleting default
-                        web.send_keys('//*[@id="supply"]',  # supply (= 1).
-                                      f'{Keys.BACKSPACE}{structure.supply}')
-            else:  # This is important for the sale part.
-                structure.supply = 1
-            # Set Blockchain if it's different from "Ethereum".
-            if structure.blockchain != '':  # If it's not an empty string.
-                if web.visible('//*[@id="chain"]').get_attribute('value') \
-                        != structure.blockchain:  # Compare to the span text.
-                    try:  # Try to select the Blockchain.
-                        web.clickable('//*[@id="chain"]/..')  # Open the sheet.
-                        web.clickable('//span[contains(text(), '
-                                      f'"{structure.blockchain}")]/../..')
-                    except Exception:  # Blockchain is unknown.
-                        raise TE('Blockchain is unknown or badly written.')
-            else:  # This is important for the sale part.
-                structure.blockchain = 'Ethereum'
-            web.clickable('(//div[contains(@class, "submit")])'  # Click on the
-                          '[position()=1]/div/span/button')  # "Create" button.
-            # Check for captchas
-            self.check_for_captcha()
-
-            # Verify upload
-            WDW(web.driver, 2400).until(lambda _: web.driver.current_url != self.create_url + '?enable_supply=true')
-            print(f'{green}| Uploaded{reset}')
+                            actual_element = f'{table}/tr[{number_}]/td[{rank}]/div/div/input'
+                            self.web.clear_text(actual_element)  # Default text.
+                            self.web.send_keys(actual_element, data[rank - 1])
+            self.web.clickable('trait_save')  # Click on the "Save" button.
+        # Click on the "Unlockable Content" switch if it's true.
+        if isinstance(nft.unlockable_content, list):  # If not False.
+            if len(nft.unlockable_content) > 0:  # Not an empty list.
+                if isinstance(nft.unlockable_content[0], bool):
+                    if nft.unlockable_content[0]:  # If True.
+                        self.web.send_keys('unlockable_toggle', Keys.ENTER)  # Toggle button.
+                        unlockable = 'unlockable_text'
+                        if settings['fast_fill']:  # Set with the other texts.
+                            texts[unlockable] = nft.unlockable_content[1]
+                        else:  # Input the unlockable content.
+                            self.web.send_keys(unlockable, nft.unlockable_content[1])
+        # Set all the texts at once.
+        if settings['fast_fill']:
+            self.fill_texts(texts)
+
+        # Click on the "Explicit & Sensitive Content" switch if it's true.
+        if nft.explicit_and_sensitive_content != '':  # Not empty.
+            if isinstance(nft.explicit_and_sensitive_content, bool):
+                if nft.explicit_and_sensitive_content:  # True.
+                    self.web.send_keys('explicit_toggle', Keys.ENTER)  # Toggle button.
+        # Set number of supplies if it's not an empty string.
+        if nft.supply != '' and 'supply=' in self.web.driver.current_url:
+            if isinstance(nft.supply, int):  # Integer.
+                if nft.supply > 1:  # Set supplies deleting default
+                    self.web.send_keys('supply',  # supply (= 1).
+                                  f'{Keys.BACKSPACE}{nft.supply}')
+        else:  # This is important for the sale part.
+            nft.supply = 1
+        # Set Blockchain if it's different from "Ethereum".
+        if nft.blockchain != '':  # If it's not an empty string.
+            if self.web.visible('chain').get_attribute('value') \
+                    != nft.blockchain:  # Compare to the span text.
+                try:  # Try to select the Blockchain.
+                    self.web.clickable('//*[@id="chain"]/..')  # Open the sheet.
+                    self.web.clickable('//span[contains(text(), '
+                                  f'"{nft.blockchain}")]/../..')
+                except Exception:  # Blockchain is unknown.
+                    raise TE('Blockchain is unknown or badly written.')
+        else:  # This is important for the sale part.
+            nft.blockchain = 'Ethereum'
+        self.web.clickable('create')  # Click on the "Create" button.
+        # Check for captchas
+        self.check_for_captcha()
+
+    """ Fill texts
+    * Inputs the text fields of the create form, with one script in fast fill mode
+    @Params:
+    - texts: The XPath of every field and its value, the empty ones are skipped
+    """
+    def fill_texts(self, texts: dict) -> None:
+        texts = {element: value for element, value in texts.items() if value != ''}
+        if not texts:
+            return
+        failed = self.web.fill_values(texts) if settings['fast_fill'] else list(texts)
+
+        for element in failed:  # Typed, over the value of the script.
+            if settings['fast_fill']:
+                self.web.clear_text(element)
+            self.web.send_keys(element, texts[element])
+
+    """ OpenSea created
+    * Checks if the submitted NFT left the create page
+    @Returns: Whether the NFT is created
+    """
+    def opensea_created(self) -> bool:
+        return self.web.driver.current_url != self.create_url + '?enable_supply=true'
 
-            # Set the new structure nft_url
-            structure.nft_url = web.driver.current_url
+    """ OpenSea uploaded
+    * Saves the URL of the created NFT
+    @Params:
+    - nft: The uploaded NFT
+    """
+    def opensea_uploaded(self, nft: NFTRecord) -> None:
+        print(f'{green}| Uploaded{reset}')
 
-            # Save for continued uploads
-            structure.save_nft(structure.uploaded_file, structure)
+        # Set the new structure nft_url
+        nft.nft_url = self.web.driver.current_url
 
-            return True  # If it perfectly worked.
-        except Exception as error:  # An element is not reachable.
-            print(f'{red}An error occured. {error}')
-            return False  # If it failed.
+        # Save for continued uploads
+        self.structure.save_nft(self.structure.uploaded_file, nft)
 
     """ OpenSea check upload
     * Verifies the NFT has been uploaded to OpenSea
     @Params:
-    - number: The item index to verify
+    - nft: The NFT to verify
     """
-    def opensea_check_upload(self, number: int) -> None:
-        if not 1 in structure.action:
-            print(f'\nChecking NFT upload n°{number}/{len(structure.file)}. -{structure.nft_name}')
+    @flow('verify')
+    def opensea_check_upload(self, nft: NFTRecord) -> None:
+        if not 1 in self.structure.action:
+            print(f'\nChecking NFT upload n°{nft.number}/{self.reader.lenght_file or "?"}. -{nft.nft_name}')
         else:
             print('| Checking upload')
 
         # Go to the edit url
-        web.driver.get(structure.nft_url)  
+        self.web.get(nft.nft_url)  
 
-        # Check for NFT
+        # Check for NFT, a just uploaded NFT can be a 404 page until it is reloaded.
+        title = f'//h1[@title="{nft.nft_name}"]'
         try:
-            web.visible(f'//h1[@title="{structure.nft_name}"]')
+            try:
+                self.web.visible(title)
+            except TE:
+                self.web.driver.refresh()
+                self.web.visible(title)
             print('| Exists.')
-            structure.save_nft(structure.verified_file, structure)
+            self.structure.save_nft(self.structure.verified_file, nft)
 
         except Exception as error:  # An error occured while looking for edit
             print(f'| Missing... Error {error}')
-            structure.missing.append(structure.nft_name)
-
-        time.sleep(2)
+            self.structure.missing.append(nft.nft_name)
 
     """ OpenSea sell
     * Posts the NFT for sale
     @Params:
-    - number: The item index to sell
+    - nft: The NFT to sell
+    @Returns: Whether the NFT is listed
     """
-    def opensea_sell(self, number: int, date: str = date_format) -> None:
+    @flow('sell')
+    def opensea_sell(self, nft: NFTRecord, date: str = date_format) -> bool:
 
-        if not 1 in structure.action and not 4 in structure.action:
-            print(f'\nSale of the NFT n°{number}/{len(structure.file)}. -{structure.nft_name}')
+        if not 1 in self.structure.action and not 4 in self.structure.action:
+            print(f'\nSale of the NFT n°{nft.number}/{self.reader.lenght_file or "?"}. -{nft.nft_name}')
         else:
             print('| Posting for sale')
 
-        try:  # Try to sell the NFT with different types and methods.
-
-            # Go to the sell page
-            web.driver.get(structure.nft_url + '/sell')
-
-
-            # Make sure there is a supply count
-            if not isinstance(structure.supply, int): 
-                raise TE('The supply number must be an integer.')
-
-            # Continue with the sale
-            elif structure.supply == 1 and structure.blockchain == 'Ethereum':
-
-                # Check for price value type
-                if not isinstance(structure.price, int) and not isinstance(structure.price, float):
-                    raise TE('The price must be an integer or a float.')
-
-                # Timed auction
-                if 'Timed' in str(structure.type):
-                    web.clickable('//i[@value="timelapse"]/../..')
-
-                    # Check for sale method
-                    if isinstance(structure.method, list):  # If it's a list.
-
-                        # Check for more sale options
-                        if len(structure.method) == 2:  # [method, price]
-
-                            # Check for method price types
-                            if not isinstance(structure.method[1], int) and not isinstance(structure.method[1], float):
-                                raise TE('Prices must be integer or float.')
-
-                            if 'declining' in str(structure.method[0]): # Declining price
-                                web.clickable('//*[@id="main"]/div/div/div[3]/div/div[2]/div/div[1]/form/div[2]/div/div[2]')
-                                web.clickable('//*[@role="tooltip"]/div/div/ul/li/button')
-
-                                # Make sure the the starting price is higher than the ending price
-                                if structure.method[1] < structure.price:
-                                    web.send_keys('//*[@name="endingPrice"]', format(structure.method[1], '.8f'))
-                                else:  # Ending price is higher than the startin price.
-                                    raise TE('The ending price must be higher than the starting price.')
-
-                            elif 'highest' in str(structure.method[0]): # Highest bidder
-                                if structure.method[1] > 0:  # Reserve price.
-
-                                    # Reserve price must be higher than the starting price
-                                    if structure.method[1] <= 1 or structure.method[1] < structure.price:
-                                        raise TE('Reserve price must be higher than 1 WETH and the price.')
-
-                                    web.clickable('//button[contains(@class, "more-options")]')
-                                    web.send_keys('//*[@role="switch"]', Keys.ENTER)
-                                    web.send_keys('//*[@name="reservePrice"]', format(structure.method[1], '.8f'))
-
-                            else:  # Not a Declining price or a Highest bidder.
-                                raise TE('Unknown method for Timed Auction.')
-
-            # Set a quantity of supply.
-            elif structure.supply > 1: 
-
-                # Make sure value is int 
-                if isinstance(structure.quantity, int):
-                    if structure.quantity <= structure.supply:
-                        web.send_keys('//*[@id="quantity"]', f'{Keys.BACKSPACE}{structure.quantity}')
-                    else:  # Quantity number is higher that supply number.
-                        raise TE('Quantity must be less or equal to supplies.')
-
-            # Make sure the right blockchain types is selected
-            elif structure.blockchain not in ('Ethereum', 'Polygon'):
-                raise TE('Blockchain is unknown or badly written.')
-
-            # Set a specific buyer.
-            if 'Timed' not in str(structure.type):  
-                if isinstance(structure.specific_buyer, list):
-                    if len(structure.specific_buyer) == 2:
-                        if isinstance(structure.specific_buyer[0], bool):
-                            if structure.specific_buyer[0]:
-                                web.clickable('//button[contains(@class, "more-options")]')
-                                web.send_keys('(//*[@role="switch"])[last()]', Keys.ENTER)
-                                web.send_keys('//*[@id="reservedBuyerAddressOrEnsName"]', structure.specific_buyer[1])
-
-            web.send_keys('//*[@name="price"]', format(structure.price, '.8f'))
-
-            # Durations
-            if isinstance(structure.duration, str):
-                structure.duration = [structure.duration]
-            if isinstance(structure.duration, list):  # List of 1 or 2 values.
-
-                # Date range
-                if len(structure.duration) == 2:  # From {date} to {date}.
-                    from datetime import datetime as dt  # Default import.
-
-                    # Check if duration is less than 6 months.
-                    if (dt.strptime(structure.duration[1], date) - dt.strptime(structure.duration[0], date)).total_seconds() / 60 > 262146:
-                        raise TE('Duration must be less than 6 months.')
-
-                    # Check if starting date has passed.
-                    if dt.strptime(dt.strftime(dt.now(), date), date) > dt.strptime(structure.duration[0], date):
-                        raise TE('Starting date has passed.')
-
-                    # Split the date and the time.
-                    start_date, start_time = structure.duration[0].split(' ')
-                    end_date, end_time = structure.duration[1].split(' ')
-                    web.clickable('//*[@id="duration"]')
-                    web.visible('//*[@role="dialog"]').location_once_scrolled_into_view
-                    web.send_date('//*[@role="dialog"]/div[2]/div[2]/div/div[2]/input', end_date)
-                    web.send_date('//*[@role="dialog"]/div[2]/div[1]/div/div[2]/input', start_date)
-                    web.send_date('//*[@id="end-time"]', end_time)
-                    web.send_date('//*[@id="start-time"]', f'{start_time}{Keys.ENTER}')
-
-                # Just a duration
-                elif len(structure.duration) == 1:
-                    if structure.duration[0] == '':
-                        raise TE('Duration must be specified.')
-                    if web.visible('//*[@id="duration"]/div[2]').text != structure.duration[0]:
-                        web.clickable('//*[@id="duration"]') 
-                        web.clickable('//*[@role="dialog"]/div[1]/div/div[2]/input')  # sheet.
-                        web.clickable(f'//span[contains(text(), "{structure.duration[0]}")]/../..')
-                        web.send_keys('//*[@role="dialog"]', Keys.ENTER)
-
-            # Cpmlete listing
-            try:
-                web.clickable('//button[@type="submit"]')
-            except Exception:  # An unknown error has occured.
-                raise TE('The submit button cannot be clicked.')
-
-            # Polygon blockchain requires a click on a button.
-            try:  
-                self.sign_contract()
-            except Exception:  # No deposit or an unknown error occured.
-                raise TE('You need to make a deposit before proceeding to listing of your NFTs.')
-
-            # Switch back to the OpenSea tab.
-            web.window_handles(1)  
+        try:  # Try to sell the NFT, the listing is retried if it fails.
+            self.retry.run('sell', self.opensea_listing, nft, date, restart=self.restart)
+            return True
 
-            # Wait until the NFT is listed.
-            try:
-
-                # Check for sold modal
-                try:   
-                    web.visible('//header/h4')  # "Your NFT is listed!".
-                except Exception:
-                    raise TE('| Someting happened, the sale did not finish.')
+        except Exception as error:  # Failed, an error has occured.
+            print(f'{red}| Sale cancelled. {error}')
+            self.structure.failed.append(nft.nft_name)
+            return False
 
-                # Verify for sale
-                try:
-                    web.driver.get(structure.nft_url)
+    """ OpenSea listing
+    * Lists the NFT with different types and methods
+    @Params:
+    - nft: The NFT to sell
+    - date: The format of the duration dates
+    """
+    def opensea_listing(self, nft: NFTRecord, date: str) -> None:
+        # Go to the sell page
+        self.web.get(nft.nft_url + '/sell')
+
+
+        # Make sure there is a supply count
+        if not isinstance(nft.supply, int): 
+            raise PermanentError('The supply number must be an integer.')
+
+        # Continue with the sale
+        elif nft.supply == 1 and nft.blockchain == 'Ethereum':
+
+            # Check for price value type
+            if not isinstance(nft.price, int) and not isinstance(nft.price, float):
+                raise PermanentError('The price must be an integer or a float.')
+
+            # Timed auction
+            if 'Timed' in str(nft.type):
+                self.web.clickable('//i[@value="timelapse"]/../..')
+
+                # Check for sale method
+                if isinstance(nft.method, list):  # If it's a list.
+
+                    # Check for more sale options
+                    if len(nft.method) == 2:  # [method, price]
+
+                        # Check for method price types
+                        if not isinstance(nft.method[1], int) and not isinstance(nft.method[1], float):
+                            raise PermanentError('Prices must be integer or float.')
+
+                        if 'declining' in str(nft.method[0]): # Declining price
+                            self.web.clickable('//*[@id="main"]/div/div/div[3]/div/div[2]/div/div[1]/form/div[2]/div/div[2]')
+                            self.web.clickable('//*[@role="tooltip"]/div/div/ul/li/button')
+
+                            # Make sure the the starting price is higher than the ending price
+                            if nft.method[1] < nft.price:
+                                self.web.send_keys('ending_price', format(nft.method[1], '.8f'))
+                            else:  # Ending price is higher than the startin price.
+                                raise PermanentError('The ending price must be higher than the starting price.')
+
+                        elif 'highest' in str(nft.method[0]): # Highest bidder
+                            if nft.method[1] > 0:  # Reserve price.
+
+                                # Reserve price must be higher than the starting price
+                                if nft.method[1] <= 1 or nft.method[1] < nft.price:
+                                    raise PermanentError('Reserve price must be higher than 1 WETH and the price.')
+
+                                self.web.clickable('//button[contains(@class, "more-options")]')
+                                self.web.send_keys('//*[@role="switch"]', Keys.ENTER)
+                                self.web.send_keys('reserve_price', format(nft.method[1], '.8f'))
+
+                        else:  # Not a Declining price or a Highest bidder.
+                            raise PermanentError('Unknown method for Timed Auction.')
+
+        # Set a quantity of supply.
+        elif nft.supply > 1: 
+
+            # Make sure value is int 
+            if isinstance(nft.quantity, int):
+                if nft.quantity <= nft.supply:
+                    self.web.send_keys('quantity', f'{Keys.BACKSPACE}{nft.quantity}')
+                else:  # Quantity number is higher that supply number.
+                    raise PermanentError('Quantity must be less or equal to supplies.')
+
+        # Make sure the right blockchain types is selected
+        elif nft.blockchain not in ('Ethereum', 'Polygon'):
+            raise PermanentError('Blockchain is unknown or badly written.')
+
+        # Set a specific buyer.
+        if 'Timed' not in str(nft.type):  
+            if isinstance(nft.specific_buyer, list):
+                if len(nft.specific_buyer) == 2:
+                    if isinstance(nft.specific_buyer[0], bool):
+                        if nft.specific_buyer[0]:
+                            self.web.clickable('//button[contains(@class, "more-options")]')
+                            self.web.send_keys('(//*[@role="switch"])[last()]', Keys.ENTER)
+                            self.web.send_keys('reserved_buyer', nft.specific_buyer[1])
+
+        self.web.send_keys('price', format(nft.price, '.8f'))
+
+        # Durations
+        if isinstance(nft.duration, list):  # List of 1 or 2 values.
+
+            # Date range
+            if len(nft.duration) == 2:  # From {date} to {date}.
+                # Check if duration is less than 6 months.
+                if (dt.strptime(nft.duration[1], date) - dt.strptime(nft.duration[0], date)).total_seconds() / 60 > 262146:
+                    raise PermanentError('Duration must be less than 6 months.')
+
+                # Check if starting date has passed.
+                if dt.strptime(dt.strftime(dt.now(), date), date) > dt.strptime(nft.duration[0], date):
+                    raise PermanentError('Starting date has passed.')
+
+                # Split the date and the time.
+                start_date, start_time = nft.duration[0].split(' ')
+                end_date, end_time = nft.duration[1].split(' ')
+                self.web.clickable('duration')
+                self.web.visible('//*[@role="dialog"]').location_once_scrolled_into_view
+                self.web.send_date('//*[@role="dialog"]/div[2]/div[2]/div/div[2]/input', end_date)
+                self.web.send_date('//*[@role="dialog"]/div[2]/div[1]/div/div[2]/input', start_date)
+                self.web.send_date('end_time', end_time)
+                self.web.send_date('start_time', f'{start_time}{Keys.ENTER}')
+
+            # Just a duration
+            elif len(nft.duration) == 1:
+                if nft.duration[0] == '':
+                    raise PermanentError('Duration must be specified.')
+                if self.web.visible('duration_text').text != nft.duration[0]:
+                    self.web.clickable('duration')
+                    self.web.clickable('//*[@role="dialog"]/div[1]/div/div[2]/input')  # sheet.
+                    self.web.clickable(f'//span[contains(text(), "{nft.duration[0]}")]/../..')
+                    self.web.send_keys('//*[@role="dialog"]', Keys.ENTER)
+
+        # Cpmlete listing
+        try:
+            self.web.clickable('sell_submit')
+        except Exception:  # An unknown error has occured.
+            raise TE('The submit button cannot be clicked.')
 
-                    if 'declining' in str(structure.method[0]): # Declining price
-                        sale_text_check = '//div[contains(text(), "Current price")]'  
-                    elif 'highest' in str(structure.method[0]): # Highest bidder
-                        sale_text_check = '//div[contains(text(), "Minimum bid")]'  
+        # Polygon blockchain requires a click on a button.
+        try:  
+            self.sign_contract(nft)
+        except Exception:  # No deposit or an unknown error occured.
+            raise PermanentError('You need to make a deposit before proceeding to listing of your NFTs.')
 
-                    WDW(web.driver, 2).until(EC.visibility_of_element_located((By.XPATH, sale_text_check)))
+        # Switch back to the OpenSea tab.
+        self.web.window_handles(1)  
 
-                except Exception:
-                    raise TE('| Item is not for sale')
+        # Wait until the NFT is listed, check for the sold modal.
+        try:   
+            self.web.visible('listed')  # "Your NFT is listed!".
+        except Exception:
+            raise TE('| Someting happened, the sale did not finish.')
 
-                print(f'{green}| Up for sale.')
+        # Verify for sale
+        try:
+            self.web.get(nft.nft_url)
 
-                # Update the sale date
-                from datetime import datetime as dt
-                structure.sale_date = dt.now().strftime(date_format)
+            if 'declining' in str(nft.method[0]): # Declining price
+                sale_text_check = '//div[contains(text(), "Current price")]'  
+            elif 'highest' in str(nft.method[0]): # Highest bidder
+                sale_text_check = '//div[contains(text(), "Minimum bid")]'  
 
-                # Save for continued saves
-                structure.save_nft(structure.sale_file, structure)
+            self.web.visible(sale_text_check, 2)
 
-                # Sleep for just a second
-                time.sleep(1)
+        except Exception:
+            raise TE('| Item is not for sale')
 
-            except Exception as error:  # An error occured while listing the NFT.
-                print(f'The NFT is not listed, try again. {error}')
-                self.opensea_sell(number)
+        print(f'{green}| Up for sale.')
 
+        # Update the sale date
+        nft.sale_time = dt.now().replace(second=0, microsecond=0)
+        nft.sale_date = nft.sale_time.strftime(date_format)
 
-        except Exception as error:  # Failed, an error has occured.
-            print(f'{red}| Sale cancelled. {error}')
+        # Save for continued saves
+        self.structure.save_nft(self.structure.sale_file, nft)
 
     """ OpenSea check sale
     * Verifies the NFT sale and reposts if sale is over
     @Params:
-    - number: The item index to verify
+    - nft: The NFT to verify
     """    
-    def opensea_check_sale(self, number: int) -> None:
-        print(f'\nVerifying sale of the NFT n°{number}/{len(structure.file)}. -{structure.nft_name}')
+    @flow('check_sale')
+    def opensea_check_sale(self, nft: NFTRecord) -> None:
+        print(f'\nVerifying sale of the NFT n°{nft.number}/{self.reader.lenght_file or "?"}. -{nft.nft_name}')
 
         try:
 
             # Jump to the NFT
-            web.driver.get(structure.nft_url)
+            self.web.get(nft.nft_url)
 
             # Check  for sale
             try:
-                if 'declining' in str(structure.method[0]): # Declining price
+                if 'declining' in str(nft.method[0]): # Declining price
                     sale_text_check = '//div[contains(text(), "Current price")]'  
-                elif 'highest' in str(structure.method[0]): # Highest bidder
+                elif 'highest' in str(nft.method[0]): # Highest bidder
                     sale_text_check = '//div[contains(text(), "Minimum bid")]'  
 
-                WDW(web.driver, 2).until(EC.visibility_of_element_located((By.XPATH, sale_text_check)))
+                self.web.visible(sale_text_check, 2)
 
                 print(f'| Still up for sale')
 
-                # Pause for a second
-                time.sleep(1)
-
             except Exception: # Remove sale data
                 print('| Sale has ended')
 
-                # Remove from sale list
+                # Remove from sale list, the file is compacted at the end of the pass.
                 try:
-                    with open(reader.path, 'r+', encoding='utf-8') as file:
-
-                        # Get the content an sort
-                        lines = file.readlines()
-                        header = lines.pop(0).strip() # Save the header before sorting
-                        lines.sort(key = lambda x: x.split(';; ').pop())
-                        lines.insert(0, header) # Add header back
-
-                        # Clean
-                        file.seek(0)
-                        file.truncate()
-                    
-                        # Rewrite the file
-                        for line in enumerate(lines):
-                            line_to_write = line[1].strip()
-
-                            # Add line breaks before each line but the header
-                            if not header in line_to_write:
-                                line_to_write = '\n' + line_to_write
-
-                            # Leave out the nft that is being deleted
-                            if not f'{structure.nft_name};' in line_to_write:
-                                file.write(line_to_write)
-
+                    self.structure.end_sale(nft)
                     print('| Sale data removed')
 
                 except Exception as error:
@@ -1175,27 +3229,27 @@ class OpenSea:
 
                 # Sell
                 print('| Reposting for sale')
-                try:
-                    self.opensea_sell(number)
-                except Exception as error:
-                    print(f'| Could not repost for sale.. {error}')
-                    structure.save_nft(structure.sale_file, structure)
+                if not self.opensea_sell(nft):  # Keep the sale line to check it again.
+                    print('| Could not repost for sale..')
+                    self.structure.restore_sale(nft)
                     print('| Data restored')
 
         except Exception as error:
-            print(f'{red}| Could not verify sale of NFT -{structure.nft_name}. Error:{error}')
+            print(f'{red}| Could not verify sale of NFT -{nft.nft_name}. Error:{error}')
+            self.structure.failed.append(nft.nft_name)
 
     """ OpenSea remove
     * Removes the NFT from OpenSea
     @Params:
-    - number: The item index to remove
+    - nft: The NFT to remove
     """ 
-    def opensea_remove(self, number: int) -> None:
+    @flow('remove')
+    def opensea_remove(self, nft: NFTRecord) -> None:
         """Remove the NFT"""
-        print(f'\nDeleting NFT n°{number}/{len(structure.file)}.')
+        print(f'\nDeleting NFT n°{nft.number}/{self.reader.lenght_file or "?"}.')
 
         # Go to the edit url
-        web.driver.get(structure.nft_url)  
+        self.web.get(nft.nft_url)  
 
         # Try to delete the NFT.
         try:  
@@ -1203,20 +3257,138 @@ class OpenSea:
 
             # Check for NFT
             try:
-                WDW(web.driver, 10).until(EC.visibility_of_element_located((By.XPATH, edit_button)))
+                self.web.visible(edit_button)
             except Exception:  # An error occured while looking for edit
                 raise TE('-NFT does not exist or did not load')
 
-            # web.driver.refresh()  # Reload the page to prevent a blank page.
-            web.clickable(edit_button)  # Click Edit.
-            web.clickable('//button[contains(text(), "Delete item")]')  # Click Delete Item.
-            web.visible('//*[contains(text(), "Are you sure you want to delete this item? ")]')
-            web.clickable('//div[@class="Overlayreact__Overlay-sc-1yn7g51-0 ebMEfa"]/div/div/footer/div/button')
-            web.visible('//span[contains(text(), "Deleted! Changes will take a minute to reflect.")]')  # Wait for deletion.
+            # self.web.driver.refresh()  # Reload the page to prevent a blank page.
+            self.web.clickable(edit_button)  # Click Edit.
+            self.web.clickable('//button[contains(text(), "Delete item")]')  # Click Delete Item.
+            self.web.visible('//*[contains(text(), "Are you sure you want to delete this item? ")]')
+            self.web.clickable('delete_confirm')
+            self.web.visible('//span[contains(text(), "Deleted! Changes will take a minute to reflect.")]')  # Wait for deletion.
             print('| Deleted.')
 
         except Exception as error: # Faled, an error has occured
             print(f'{red}| Counld not remove the NFT. {error}')
+            self.structure.failed.append(nft.nft_name)
+
+
+""" Tab pipeline
+* Pipelines the uploads in several OpenSea tabs of one logged in session,
+* the next create form is filled while the previous ones wait for their minting
+"""
+class TabPipeline:
+
+    """ Init
+    @Params:
+    - opensea: The logged in OpenSea controller
+    - tabs: The number of OpenSea tabs
+    """
+    def __init__(self, opensea: OpenSea, tabs: int) -> None:
+        self.opensea = opensea
+        self.web = opensea.web
+        self.tabs = tabs
+        self.free = []  # Handles of the idle tabs.
+        self.pending = {}  # Handle of a tab waiting for its upload: (NFT, deadline).
+        opensea.pipeline = self  # No browser restart while uploads are pending.
+
+    """ Open
+    * Opens the OpenSea tabs next to the first one
+    """
+    def open(self) -> None:
+        self.pending.clear()
+        self.web.tabs = []
+        self.web.window_handles(1)  # The OpenSea tab of the login.
+        self.web.tabs.append(self.web.driver.current_window_handle)
+        while len(self.web.tabs) < self.tabs:
+            self.web.tabs.append(self.web.new_tab())
+        self.free = list(self.web.tabs)
+
+    """ Switch
+    * Moves to a tab, the wallet pop ups come back to it
+    @Params:
+    - handle: The tab handle
+    """
+    def switch(self, handle: str) -> None:
+        self.web.tab = handle
+        self.web.elements.clear()
+        self.web.driver.switch_to.window(handle)
+
+    """ Tab
+    * Waits for an idle tab and moves to it
+    @Returns: The tab handle
+    """
+    def tab(self) -> str:
+        if self.web.tabs == []:  # New browser after a restart, its tabs are opened again.
+            self.open()
+
+        while not self.free:
+            if not self.poll():
+                time.sleep(self.web.poll)
+
+        handle = self.free.pop(0)
+        self.switch(handle)
+        return handle
+
+    """ Poll
+    * Finishes the uploads whose tab left the create page
+    @Returns: Whether a tab is idle again
+    """
+    def poll(self) -> bool:
+        done = False
+        for handle, (nft, deadline) in list(self.pending.items()):
+            try:
+                self.switch(handle)
+                if not self.opensea.opensea_created():
+                    if time.monotonic() < deadline:
+                        continue
+                    raise TE('The upload has timed out.')
+
+                print(f'\nTab of the NFT n°{nft.number} -{nft.nft_name}:')
+                self.opensea.opensea_uploaded(nft)
+                del self.pending[handle]  # Saved, the browser may restart while it is verified and sold.
+                process_nft(self.opensea, nft, uploaded=True)  # Verify and sell it in its tab.
+
+            except Exception as error:  # The tab crashed or the upload failed.
+                print(f'{red}An error occured with the NFT -{nft.nft_name}. {error}')
+                self.opensea.structure.failed.append(nft.nft_name)
+
+            self.pending.pop(handle, None)
+            if handle in self.web.tabs:  # Still open.
+                self.free.append(handle)
+            done = True
+
+        return done
+
+    """ Process
+    * Fills the create form of a new NFT in an idle tab, the other actions run at once
+    @Params:
+    - nft: The NFT to process
+    """
+    def process(self, nft: NFTRecord) -> None:
+        handle = self.tab()
+        if nft.nft_name in self.opensea.structure.uploaded or nft.number in self.opensea.structure.duplicates:
+            process_nft(self.opensea, nft)
+            self.free.append(handle)
+            return
+
+        print(f'\nUploading NFT n°{nft.number}/{self.opensea.reader.lenght_file or "?"}. -{nft.nft_name}')
+        try:
+            self.opensea.opensea_create(nft)
+            self.pending[handle] = (nft, time.monotonic() + 2400)
+        except Exception as error:  # An element is not reachable.
+            print(f'{red}An error occured. {error}')
+            self.opensea.structure.failed.append(nft.nft_name)
+            self.free.append(handle)
+
+    """ Drain
+    * Waits for the uploads of every tab
+    """
+    def drain(self) -> None:
+        while self.pending:
+            if not self.poll():
+                time.sleep(self.web.poll)
 
 
 # App Utilities
@@ -1228,9 +3400,16 @@ class OpenSea:
 @Params:
 - file_: The file to reaad/save to
 - question: The prompt for input
+- ask: Whether to prompt for an empty file, the command line runs stop instead
 @Returns: The file or prompt input value.
 """
-def read_file(file_: str, question: str) -> str:
+def read_file(file_: str, question: str, ask: bool = True) -> str:
+    if not ask:  # Nobody to answer the question.
+        text = open(f'assets/{file_}.txt', encoding='utf-8').read() if os.path.isfile(f'assets/{file_}.txt') else ''
+        if text == '':
+            exit(f'The {file_} is missing. Set it in the config file or in assets/{file_}.txt.')
+        return text
+
     if not os.path.isfile(f'assets/{file_}.txt'):
         open(f'assets/{file_}.txt', 'a')  # Create a file if it doesn't exist.
 
@@ -1267,7 +3446,7 @@ def perform_action() -> list:
         # Check if answer is a number.
         if number.isdigit():  
             if int(number) > 0 and int(number) < 7:
-                return [[1, 2, 3], [1], [2], [3], [4], [5]][int(number) - 1]
+                return menu_actions[int(number) - 1]
 
         print(f'{red}You must choose an option from the list.')
         return perform_action()
@@ -1304,13 +3483,14 @@ def data_file() -> str:
         data_files = [glob(f'data{path_sep}{extension}') for extension in ['*.json', '*.csv', '*.xlsx']]
         for files in sorted(data_files):
             for file in files:
-                files_list.append(file)
+                if not file.endswith((preflight_suffix, media_index_suffix, duplicates_suffix)):  # Written by the bot.
+                    files_list.append(file)
 
         # Files in the data sub folders
         sub_folders = [glob(f'data{path_sep}*{path_sep}{extension}') for extension in ['*.json', '*.csv', '*.xlsx']]
         for files in sorted(sub_folders):
             for file in files:
-                if 'Templates' not in file:
+                if 'Templates' not in file and not file.endswith((preflight_suffix, media_index_suffix, duplicates_suffix)):
                     files_list.append(file)
 
         print(f'{yellow}\nChoose your file:{reset}\n0 - Browse a file on PC.')
@@ -1347,6 +3527,86 @@ def data_file() -> str:
         print(f'{red}File doesn\'t exist.')
 
 
+""" Arguments
+* Reads the command line and its JSON config file. A run with a wallet, an
+* action and a data file skips every prompt, for the scheduled batches
+@Returns: The run arguments, the settings they change are applied
+"""
+def arguments():
+    from argparse import ArgumentParser
+    from json import load, loads
+
+    parser = ArgumentParser(description='Upload, verify, sell and delete NFTs on OpenSea.',
+                            epilog=f'Exit status: {status_done} done, {status_failed} some NFTs failed, '
+                                   f'{status_usage} wrong arguments, {status_crashed} a browser session stopped.')
+    parser.add_argument('-c', '--config', help='JSON file with the wallet, action, data, password, '
+                        'recovery_phrase and settings keys, the arguments override it.')
+    parser.add_argument('-w', '--wallet', choices=('coinbase', 'metamask'), help='The wallet to log in with.')
+    parser.add_argument('-a', '--action', type=int, choices=range(1, len(menu_actions) + 1),
+                        help='The number of the action menu: 1 upload, verify and sell, 2 upload, '
+                        '3 verify uploads, 4 sell, 5 verify sales, 6 delete.')
+    parser.add_argument('-d', '--data', help='The JSON, CSV or XLSX data file.')
+    parser.add_argument('--workers', type=int, help='Browser sessions in parallel.')
+    parser.add_argument('--tabs', type=int, help='OpenSea tabs of each browser session.')
+    parser.add_argument('--timeout', type=int, help='Seconds to wait for an element.')
+    parser.add_argument('--profile', help='Chrome profile folder keeping the logins.')
+    parser.add_argument('--timings', help='JSON or CSV report of the timings.')
+    parser.add_argument('--headless', action='store_true', default=None, help='Run Chrome without a window.')
+    parser.add_argument('-s', '--set', action='append', default=[], metavar='SETTING=VALUE',
+                        help='Changes any setting, the value is read as JSON or as a string.')
+    args = parser.parse_args()
+
+    # The config file, then the arguments.
+    config = {}
+    if args.config:
+        try:
+            with open(args.config, encoding='utf-8') as file:
+                config = load(file)
+        except (OSError, ValueError) as error:
+            parser.error(f'cannot read the config file. {error}')
+        if not isinstance(config, dict):
+            parser.error('the config file must be a JSON object.')
+
+    changes = dict(config.get('settings', {}))
+    changes.update({name: getattr(args, name) for name in ('workers', 'tabs', 'timeout', 'profile', 'timings', 'headless')
+                    if getattr(args, name) is not None})
+    for change in args.set:
+        name, _, value = change.partition('=')
+        try:
+            changes[name] = loads(value)
+        except ValueError:  # A plain string.
+            changes[name] = value
+
+    for name, value in changes.items():  # Typos would be ignored silently.
+        if name not in settings:
+            parser.error(f'unknown setting "{name}".')
+        expected = type(settings[name])
+        if not isinstance(value, expected) and not (expected is float and isinstance(value, int)):
+            parser.error(f'the "{name}" setting must be of type {expected.__name__}.')
+    settings.update(changes)
+
+    args.wallet = args.wallet or config.get('wallet')
+    args.action = args.action or config.get('action')
+    args.data = args.data or config.get('data')
+    args.password = config.get('password', '')
+    args.recovery_phrase = config.get('recovery_phrase', '')
+
+    # Without a wallet, an action and a data file the run asks for them.
+    args.batch = any((args.wallet, args.action, args.data))
+    if args.batch:
+        missing = [name for name in ('wallet', 'action', 'data') if not getattr(args, name)]
+        if missing:
+            parser.error(f'a run without prompts needs a {", ".join(missing)}.')
+        if args.wallet not in ('coinbase', 'metamask'):
+            parser.error(f'unknown wallet "{args.wallet}".')
+        if args.action not in range(1, len(menu_actions) + 1):
+            parser.error(f'unknown action "{args.action}".')
+        if not os.path.isfile(args.data):
+            parser.error(f'the data file {args.data} doesn\'t exist.')
+
+    return args
+
+
 """ Clear
 * Clears the console
 """
@@ -1359,123 +3619,364 @@ def cls() -> None:
 """ Exit with message
 @Params:
 - message: The message to display with exiting
+- status: The exit status, a wrong data file or value by default
 """
-def exit(message: str = '') -> None:
+def exit(message: str = '', status: int = status_usage) -> None:
     """Stop running the program using the sys module."""
     import sys
-    sys.exit(f'\n{red}{message}')
+    print(f'\n{red}{message}', file=sys.stderr)
+    sys.exit(status)
 
 
-if __name__ == '__main__':
+""" Process NFT
+* Runs the chosen actions on one NFT of the data file
+@Params:
+- opensea: The OpenSea session of the worker
+- nft: The NFT record to process
+- uploaded: Whether the NFT was just uploaded by the tab pipeline
+"""
+def process_nft(opensea: OpenSea, nft: NFTRecord, uploaded: bool = False) -> None:
+    structure = opensea.structure
+    action = structure.action
+
+    # Check to upload
+    upload = None  # Prevent Undefined value error.
+    if 1 in action and not uploaded:
+        if nft.nft_name in structure.uploaded:
+            prefix = f'NFT n°{nft.number} -{nft.nft_name} has alraedy been uploaded'
+            if 2 in action:
+                print(f'{prefix}', end=' ')
+            else:
+                print(prefix,)
 
-    cls()  # Clear console.
+        elif nft.number in structure.duplicates:  # Verified and sold as the NFT with the same media.
+            _, nft.nft_name, nft.nft_url = structure.duplicates[nft.number]
+            print(f'NFT n°{nft.number} is not uploaded, its media is already uploaded as -{nft.nft_name}')
+
+        else:
+            upload = opensea.opensea_upload(nft)  # Upload the NFT.
 
-    print(f'{green}Time to upload/sell/delete them NTFs\n')
+    # Check to verify
+    if 2 in action:
+        if nft.nft_name in structure.verified:
+            if 1 in action:
+                if 3 in action:
+                    print(', verified', end=' ')
+                else:
+                    print(', verified')
+            else:
+                print(f'NFT n°{nft.number} -{nft.nft_name} has alraedy been verified')
 
-    input('\nPRESS [ENTER] TO CONTINUE. ')
-    cls()  # Clear console.
+        else:
+            opensea.opensea_check_upload(nft)
 
-    print(f'{green}Lets get started!!')
+    # Check to sell
+    if 3 in action:
 
-    # Choose what wallet you want to use
-    wallet = choose_wallet()  # Which wallet to use
+        # Make sure the price is correct, the worker goes on with the next NFTs.
+        if not (isinstance(nft.price, int) or isinstance(nft.price, float)) or nft.price <= 0:
+            raise PermanentError(f'Price for {nft.nft_name}: {nft.price} is not the right value or type.')
 
-    # Init the OpenSea class and send the password and the recovery phrase.
-    login_prefix = ('meta', 'coin')[wallet == 0]
-    wallet_name = ("MetaMask", 'Coinbase')[wallet == 0]
+        # Skip if already in sold
+        if nft.nft_name in structure.sold:
+            print(f'NFT n°{nft.number} -{nft.nft_name} is already for sale')
+        else:
+            opensea.opensea_sell(nft)
+                
+    # Check to validate sale
+    if 4 in action:
+        end_time = nft.sale_end()
+        if end_time is None:
+            print(f'{red}Unknown sale date or duration for -{nft.nft_name}, the sale is not checked.')
+        elif end_time > dt.now():
+            print(f'NFT n°{nft.number} -{nft.nft_name} is still for sale')
+        else:
+            sale_time = nft.sale_time
+            opensea.opensea_check_sale(nft)
+            if structure.scheduler is not None:  # Check it again when its new listing ends.
+                structure.scheduler.done(nft, nft.sale_time != sale_time)
+
+    # Check to delete
+    if 5 in action:
+        opensea.opensea_remove(nft)
+
+""" Preflight
+* Checks the media files of the NFTs to upload in a thread pool,
+* before the browser starts, and reports the invalid ones
+@Params:
+- structure: The structure parsing the NFT records
+- reader: The reader of the data file
+@Returns: The numbers of the invalid NFTs
+"""
+def preflight(structure: Structure, reader: Reader) -> set:
+    from concurrent.futures import ThreadPoolExecutor
+    from itertools import islice
 
-    # Setup
-    opensea = OpenSea(wallet,
-        read_file('{}_password'.format(login_prefix), '\nWhat is your {} password? '.format(wallet_name)), 
-        read_file('{}_recovery_phrase'.format(login_prefix), '\nWhat is your {} recovery phrase? '.format(wallet_name)))
-    action = perform_action()  # What the user wants to do.
-    reader = Reader(data_file())  # Ask for a file and read it.
-    structure = Structure(action) 
-    web = Webdriver(wallet)  # Start a new webdriver and init its methods.
-
-    # Start Opensea
-    opensea.wallet_login()  # Log into wallets.
-    opensea.opensea_login()  # Connect to OpenSea.
-
-    for nft_number in range(reader.lenght_file):
-        structure.get_data(nft_number)  # Structure the data of the NFT.
-
-        # Check to upload
-        upload = None  # Prevent Undefined value error.
-        if 1 in action:
-            if structure.nft_name in structure.uploaded:
-                prefix = f'NFT n°{nft_number + 1} -{structure.nft_name} has alraedy been uploaded'
-                if 2 in action:
-                    print(f'{prefix}', end=' ')
+    def check(nft: NFTRecord) -> tuple:
+        try:
+            nft.media()
+        except TE as error:
+            return nft.number, nft.nft_name, nft.file_path, error.msg
+
+    print('\nChecking the media files.')
+    records = (nft for nft in structure.records(reader) if nft.nft_name not in structure.uploaded)
+    invalid, checked = [], 0
+
+    with ThreadPoolExecutor() as pool:
+        while True:  # By batches, the records of large files are not all in memory.
+            batch = list(islice(records, 256))
+            if not batch:
+                break
+            checked += len(batch)
+            invalid += [result for result in pool.map(check, batch) if result is not None]
+
+    if not invalid:
+        print(f'{green}{checked} media files checked, all valid.')
+        return set()
+
+    # Every invalid NFT is written to a report next to the data file.
+    report = f'{os.path.splitext(reader.path)[0]}{preflight_suffix}'
+    with open(report, 'w', encoding='utf-8') as file:
+        file.write('number;; nft_name;; file_path;; error\n')
+        file.writelines(';; '.join(map(str, row)) + '\n' for row in invalid)
+
+    print(f'{red}{len(invalid)}/{checked} NFTs have an invalid media file:')
+    for number, nft_name, _, error in invalid[:20]:
+        print(f'{red}| n°{number} -{nft_name}: {error}')
+    if len(invalid) > 20:
+        print(f'{red}| ... and {len(invalid) - 20} more.')
+    print(f'{yellow}Report saved to {report}.')
+
+    return {row[0] for row in invalid}
+
+""" Feed queue
+* Puts the NFTs of the data file in the work queue
+@Params:
+- queue: The shared work queue
+- structure: The structure parsing the NFT records
+- reader: The reader of the data file
+- workers: The number of workers to stop at the end
+- skipped: The numbers of the NFTs left out
+"""
+def feed_queue(queue: Queue, structure: Structure, reader: Reader, workers: int,
+               skipped: set = frozenset()) -> None:
+    try:
+        for nft in structure.records(reader):
+            if nft.number not in skipped:
+                queue.put(nft)
+    except BaseException as error:  # A broken data file, reported by the main thread.
+        structure.feed_error = error
+    finally:  # The workers stop even if the data file is broken.
+        for _ in range(workers):
+            queue.put(None)
+
+""" Drain queue
+* Takes the NFTs left in the work queue once every worker stopped, so the
+* feeder and the batches of the sale scheduler don't wait forever
+@Params:
+- queue: The shared queue of NFT records
+- structure: The structure counting the unprocessed NFTs
+"""
+def drain_queue(queue: Queue, structure: Structure) -> None:
+    if structure.scheduler is not None:  # Don't wait for the next listings.
+        structure.scheduler.stop()
+    while True:
+        nft = queue.get()
+        queue.task_done()
+        if nft is None:  # The NFTs are all queued before the first None.
+            break
+        with structure.lock:
+            structure.unprocessed += 1
+
+""" Run worker
+* Starts a browser session and processes the NFTs of the queue
+@Params:
+- queue: The shared queue of NFT records, None stops the worker
+- wallet: The wallet choice
+- credentials: The wallet password and recovery phrase
+- structure: The structure of the data file and its ledgers
+- reader: The reader of the data file
+- profile: The persistent Chrome profile folder of the worker
+- profiler: The profiler shared by the workers, None to disable
+- retry: The retry policy shared by the workers
+- registry: The selector registry shared by the workers
+"""
+def run_worker(queue: Queue, wallet: int, credentials: tuple, structure: Structure, reader: Reader,
+               profile: str = '', profiler: Profiler = None, retry: RetryPolicy = None,
+               registry: SelectorRegistry = None) -> None:
+    with structure.lock:
+        structure.running += 1
+    web = None
+
+    try:
+        web = Webdriver(wallet, profile, profiler, registry)  # Start a new webdriver and init its methods.
+        opensea = OpenSea(wallet, *credentials, web, structure, reader, retry)
+
+        # Start Opensea
+        opensea.wallet_login()  # Log into wallets.
+        opensea.opensea_login()  # Connect to OpenSea.
+
+        # The uploads are pipelined in several tabs.
+        pipeline = TabPipeline(opensea, settings['tabs']) if settings['tabs'] > 1 and 1 in structure.action else None
+
+        while True:
+            nft = queue.get()
+            if nft is None:  # No more NFTs to process.
+                if pipeline is not None:
+                    pipeline.drain()
+                queue.task_done()
+                break
+            try:
+                if pipeline is not None:
+                    pipeline.process(nft)
                 else:
-                    print(prefix,)
+                    process_nft(opensea, nft)
+            except PermanentError as error:  # A wrong value of this NFT.
+                print(f'{red}{error.msg}')
+                structure.failed.append(nft.nft_name)
+            finally:
+                queue.task_done()  # Batches of the sale scheduler wait for it.
+
+    except BaseException as error:  # Even a SystemExit, the thread would end without a trace.
+        from traceback import print_exc
+        print_exc()
+        with structure.lock:
+            structure.crashed += 1
+            structure.running -= 1
+            last = structure.running == 0
+        if isinstance(error, KeyboardInterrupt):
+            raise
+        if last:  # Nobody takes the NFTs left anymore.
+            drain_queue(queue, structure)
+
+    else:
+        with structure.lock:
+            structure.running -= 1
+
+    finally:
+        if web is not None:
+            try:
+                web.driver.quit()  # Stop the webdriver.
+            except Exception:  # The browser already crashed.
+                pass
 
-            else:
-                upload = opensea.opensea_upload(nft_number + 1)  # Upload the NFT.
-                time.sleep(1) # Pause to prevent 404s
 
-        # Check to verify
-        if 2 in action:
-            if structure.nft_name in structure.verified:
-                if 1 in action:
-                    if 3 in action:
-                        print(', verified', end=' ')
-                    else:
-                        print(', verified')
-                else:
-                    print(f'NFT n°{nft_number + 1} -{structure.nft_name} has alraedy been verified')
+if __name__ == '__main__':
 
-            else:
-                opensea.opensea_check_upload(nft_number + 1)
-                time.sleep(1) # Pause to prevent 404s
+    args = arguments()  # The command line runs don't ask anything.
 
-        # Check to sell
-        if 3 in action:
+    if not args.batch:
+        cls()  # Clear console.
 
-            # Make sure the price is correct
-            if not (isinstance(structure.price, int) or isinstance(structure.price, float)) or structure.price <= 0:
-                exit(f'Price for {structure.nft_name}: {structure.price} is not the right value or type.')
+        print(f'{green}Time to upload/sell/delete them NTFs\n')
 
-            # Skip if already in sold
-            if structure.nft_name in structure.sold:
-                print(f'NFT n°{nft_number + 1} -{structure.nft_name} is already for sale')
-            else:
-                opensea.opensea_sell(nft_number + 1)
-                time.sleep(1) # Pause to prevent 404s
-                
-        # Check to validate sale
-        if 4 in action:
-            import datetime as dt
-            sale_time = dt.datetime.strptime(structure.sale_date, date_format)
-            now = dt.datetime.now()
-
-            # Figure out the sale duraion end
-            duration = structure.duration
-            if duration == '1 day':
-                end_time = sale_time + dt.timedelta(days=1, minutes=1)
-            elif duration == '3 days':
-                end_time = sale_time + dt.timedelta(days=3, minutes=1)
-            elif duration == '7 days':
-                end_time = sale_time + dt.timedelta(days=7, minutes=1)
-            else:
-                print(f'This duration is missing for {duration} -{structure.nft_name}')
+        input('\nPRESS [ENTER] TO CONTINUE. ')
+        cls()  # Clear console.
 
-            # Skip if already if not past sale time
-            if end_time > now:
-                print(f'NFT n°{nft_number + 1} -{structure.nft_name} is still for sale')
-            else:
-                opensea.opensea_check_sale(nft_number + 1)
+    print(f'{green}Lets get started!!')
 
-        # Check to delete
-        if 5 in action:
-            opensea.opensea_remove(nft_number + 1)
+    # Choose what wallet you want to use
+    wallet = ('coinbase', 'metamask').index(args.wallet) if args.batch else choose_wallet()  # Which wallet to use
 
-    # Pring out missing uploaded NFTs from varification
-    if 2 in action:
-        if len(structure.missing) > 0:
-            print(f'\nMissing uploads: {structure.missing}')
-        else:
-            print('\nNo missing uploads!')
+    # Read the password and the recovery phrase.
+    login_prefix = ('meta', 'coin')[wallet == 0]
+    wallet_name = ("MetaMask", 'Coinbase')[wallet == 0]
+
+    # Setup
+    credentials = (
+        args.password or read_file('{}_password'.format(login_prefix), '\nWhat is your {} password? '.format(wallet_name), not args.batch), 
+        args.recovery_phrase or read_file('{}_recovery_phrase'.format(login_prefix), '\nWhat is your {} recovery phrase? '.format(wallet_name), not args.batch))
+    action = menu_actions[args.action - 1] if args.batch else perform_action()  # What the user wants to do.
+    reader = Reader(args.data if args.batch else data_file())  # Ask for a file and read it.
+    structure = Structure(reader, action) 
+    profiler = Profiler() if settings['timings'] else None  # Time every step.
+    retry = RetryPolicy()  # Retries of the login, contract and sale flows.
+    registry = SelectorRegistry(settings['selectors'])  # Selectors of the OpenSea pages.
+
+    try:
+        try:  # A streamed JSON file is only read in full here.
+            # Find the bad media files now instead of hours into the run.
+            skipped = set()
+            if 1 in action and settings['preflight']:
+                invalid = preflight(structure, reader)
+                if invalid and settings['skip_invalid']:
+                    print(f'{yellow}The {len(invalid)} invalid NFTs are skipped.')
+                    skipped = invalid
+
+            # Don't upload the same media twice, the other actions run on the uploaded NFT.
+            media_index = MediaIndex(f'{os.path.splitext(reader.path)[0]}{media_index_suffix}')
+            if 1 in action and settings['media_index']:
+                structure.duplicates = media_index.run(structure, reader)
+
+            # Smaller copies of the images, uploaded instead of the originals.
+            optimizer = None
+            if 1 in action and settings['optimize_media']:
+                optimizer = MediaOptimizer(f'{os.path.splitext(reader.path)[0]}_optimized', media_index)
+                optimizer.run(structure, reader)
+
+            # The sales are verified by order of expiry.
+            if 4 in action:
+                structure.scheduler = SaleScheduler(structure, settings['daemon'])
+                structure.scheduler.load(reader)
+
+            # Verify the uploads over HTTP, no browser is needed if they are all verified.
+            remaining = None
+            if 2 in action and 1 not in action and settings['http_verify']:
+                remaining = HTTPVerifier().run(structure, reader)
+        except ValueError as error:  # The workers didn't start yet.
+            exit(f'The data file cannot be read. {error}')
+
+        # Fill the work queue while the NFTs are processed, every worker stops on its own None.
+        workers = max(1, min(settings['workers'], reader.lenght_file or settings['workers']))
+        queue = Queue(maxsize=workers * 2)  # Bounded so streamed files stay out of memory.
+
+        if remaining == 0 and set(action) == {2}:
+            print(f'{green}All the uploads are verified.')
 
-    web.driver.quit()  # Stop the webdriver.
+        else:
+            if structure.scheduler is not None:  # Only the ended listings are verified.
+                feeder = threading.Thread(target=structure.scheduler.feed, args=(queue, workers), daemon=True)
+            else:
+                feeder = threading.Thread(target=feed_queue, args=(queue, structure, reader, workers, skipped), daemon=True)
+            feeder.start()
+
+            if workers == 1:  # Run in this thread like before.
+                run_worker(queue, wallet, credentials, structure, reader, settings['profile'], profiler, retry, registry)
+
+            else:  # Every worker has its own browser, wallet login and profile folder.
+                print(f'{yellow}Starting {workers} workers.')
+                profiles = [f'{settings["profile"]}-{number}' if settings['profile'] else ''
+                            for number in range(workers)]
+                threads = [threading.Thread(target=run_worker, daemon=True,
+                                            args=(queue, wallet, credentials, structure, reader, profile, profiler,
+                                                  retry, registry))
+                           for profile in profiles]
+                [thread.start() for thread in threads]
+                [thread.join() for thread in threads]
+
+        # Pring out missing uploaded NFTs from varification
+        if 2 in action:
+            if len(structure.missing) > 0:
+                print(f'\nMissing uploads: {structure.missing}')
+            else:
+                print('\nNo missing uploads!')
+
+    finally:  # Even after an exit, the ledgers keep every line.
+        structure.close()  # Export the state store to the CSV ledgers.
+
+    retry.report()
+    registry.report()
+    if optimizer is not None:
+        optimizer.report(profiler)
+    if profiler is not None:
+        profiler.report(settings['timings'])
+
+    # The scheduled runs check the status to retry or to alert.
+    if structure.feed_error is not None:
+        exit(f'The data file cannot be read. {structure.feed_error}')
+    if structure.crashed or structure.unprocessed:  # Dead workers leave NFTs behind.
+        exit(f'{structure.crashed} browser session(s) stopped, {structure.unprocessed} NFTs not processed, '
+             'run again to continue.', status_crashed)
+    if structure.failed or structure.missing:
+        exit(f'{len(structure.failed) + len(structure.missing)} NFTs failed, run again to continue.', status_failed)
     print(f'\n{green}All done! Your NFTs have been taken care of.\n')
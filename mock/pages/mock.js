@@ -0,0 +1,30 @@
+// Helpers shared by the pages of the mock site.
+
+// Replaces the content of an element, the previous step is removed from the DOM
+// so the XPaths only match the elements of the current step.
+function render(element, html) {
+    element.innerHTML = html;
+}
+
+// Sends JSON to the mock API and returns the decoded answer.
+function post(url, data) {
+    return fetch(url, {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify(data || {})
+    }).then(function (response) { return response.json(); });
+}
+
+// OpenSea pages need a wallet session, like the real site.
+function requireSession() {
+    if (!localStorage.getItem('session')) {
+        location.replace('/login?referrer=' + encodeURIComponent(location.pathname));
+        return false;
+    }
+    return true;
+}
+
+// Opens the signature popup of the connected wallet.
+function openSignature() {
+    window.open('/wallet/popup.html?wallet=' + localStorage.getItem('wallet'), 'signature', 'width=360,height=600');
+}
@@ -0,0 +1,231 @@
+"""
+Local stand-in of OpenSea and of the wallet extensions.
+
+The pages have the same DOM structure and element IDs as the XPaths of the
+OpenSea class: the create form and its properties/levels/stats dialogs, the
+/sell page, the asset and edit pages and the wallet onboarding and popup
+windows. The created and listed assets are kept in memory.
+
+Point the bot to it with:
+    settings['opensea_url'] = 'http://127.0.0.1:8700'
+    settings['wallet_url'] = 'http://127.0.0.1:8700/wallet'
+
+Usage: python mock/server.py [--port 8700] [--latency 0.05]
+"""
+
+
+# Python default imports.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from html import escape
+from json import dumps, loads
+import threading
+import time
+import os
+import re
+
+
+""" Constants """
+pages = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+contract = '0x495f947276749ce646f68ac8c248420045cb7b5e'  # Shared storefront contract.
+static = {  # URL path: page file.
+    '/login': 'login.html',
+    '/asset/create': 'create.html',
+    '/mock.js': 'mock.js',
+    '/wallet/metamask/home.html': 'metamask.html',
+    '/wallet/coinbase/index.html': 'coinbase.html',
+    '/wallet/popup.html': 'popup.html',
+}
+asset_path = re.compile(r'^/assets/[a-z]+/0x[0-9a-f]+/(\d+)(/sell|/edit)?/?$')
+api_path = re.compile(r'^/api/assets(?:/(\d+)/(list|delete))?$')
+
+
+""" Store
+* The in-memory assets of the mock site
+"""
+class Store:
+
+    """ Init """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.assets = {}  # Asset ID: asset dictionary.
+        self.created = self.listed = self.deleted = 0
+
+    """ Create
+    @Params:
+    - data: The fields of the create form
+    @Returns: The URL path of the new asset
+    """
+    def create(self, data: dict) -> str:
+        with self.lock:
+            asset = self.created + 1  # IDs are never reused after a deletion.
+            chain = str(data.get('chain') or 'Ethereum')
+            self.assets[asset] = {**data, 'id': asset, 'chain': chain, 'listing': None,
+                                  'path': f'/assets/{chain.lower()}/{contract}/{asset}'}
+            self.created += 1
+            return self.assets[asset]['path']
+
+    """ Get
+    @Params:
+    - asset: The asset ID
+    @Returns: The asset, None if it doesn't exist or was deleted
+    """
+    def get(self, asset: int) -> dict:
+        with self.lock:
+            return self.assets.get(asset)
+
+    """ List
+    @Params:
+    - asset: The asset ID
+    - listing: The sale type and price
+    """
+    def list(self, asset: int, listing: dict) -> None:
+        with self.lock:
+            self.assets[asset]['listing'] = listing
+            self.listed += 1
+
+    """ Delete
+    @Params:
+    - asset: The asset ID
+    """
+    def delete(self, asset: int) -> None:
+        with self.lock:
+            self.assets.pop(asset, None)
+            self.deleted += 1
+
+    """ State
+    @Returns: The counters of the mock site
+    """
+    def state(self) -> dict:
+        with self.lock:
+            return {'assets': len(self.assets), 'created': self.created,
+                    'listed': self.listed, 'deleted': self.deleted}
+
+
+""" Handler
+* Serves the pages and the API of the mock site
+"""
+class Handler(BaseHTTPRequestHandler):
+
+    store = None  # Set by serve().
+    latency = 0.0  # Seconds added to every page, like the network.
+
+    """ Do GET """
+    def do_GET(self) -> None:
+        path = self.path.split('?')[0]
+        time.sleep(self.latency)
+
+        if path == '/':
+            return self.redirect('/login')
+        if path in static:
+            return self.send(200, open(os.path.join(pages, static[path]), 'rb').read(),
+                             'application/javascript' if path.endswith('.js') else 'text/html')
+        if path == '/api/state':
+            return self.send(200, dumps(self.store.state()).encode(), 'application/json')
+
+        match = asset_path.match(path)
+        asset = self.store.get(int(match[1])) if match else None
+        if asset is None:
+            return self.send(404, self.render('404.html'))
+
+        page = {'/sell': 'sell.html', '/edit': 'edit.html'}.get(match[2], 'asset.html')
+        listing, price = asset['listing'], ''
+        if listing is not None:  # The price box checked after a sale.
+            label = ('Current price', 'Minimum bid')[listing.get('kind') == 'auction']
+            price = f'<div><div>{label}</div><div>{escape(str(listing.get("price")))} ETH</div></div>'
+
+        self.send(200, self.render(page, name=escape(str(asset.get('name', ''))), path=asset['path'],
+                                   price=price, asset=dumps(asset).replace('</', '<\\/')))
+
+    """ Do POST """
+    def do_POST(self) -> None:
+        match = api_path.match(self.path.split('?')[0])
+        if match is None:
+            return self.send(404, b'{}', 'application/json')
+
+        data = loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        time.sleep(self.latency)
+
+        if match[1] is None:  # New asset from the create form.
+            return self.send(200, dumps({'url': self.store.create(data)}).encode(), 'application/json')
+        if self.store.get(int(match[1])) is None:
+            return self.send(404, b'{}', 'application/json')
+
+        if match[2] == 'list':
+            self.store.list(int(match[1]), data)
+        else:
+            self.store.delete(int(match[1]))
+        self.send(200, b'{}', 'application/json')
+
+    """ Render
+    * Fills a page template
+    @Params:
+    - page: The page file
+    - values: The $values of the template
+    @Returns: The page
+    """
+    def render(self, page: str, **values) -> bytes:
+        template = Template(open(os.path.join(pages, page), encoding='utf-8').read())
+        return template.safe_substitute(values).encode('utf-8')
+
+    """ Send
+    @Params:
+    - status: The HTTP status
+    - body: The response body
+    - content_type: The MIME type of the body
+    """
+    def send(self, status: int, body: bytes, content_type: str = 'text/html') -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    """ Redirect
+    @Params:
+    - location: The URL path to redirect to
+    """
+    def redirect(self, location: str) -> None:
+        self.send_response(302)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    """ Log message
+    * Silences the request logs
+    """
+    def log_message(self, *args) -> None:
+        pass
+
+
+""" Serve
+* Starts the mock site in a background thread
+@Params:
+- port: The port to listen on, 0 for a free one
+- latency: Seconds added to every page and API call
+@Returns: The running server, its URL is server.url
+"""
+def serve(port: int = 0, latency: float = 0.0) -> ThreadingHTTPServer:
+    handler = type('MockHandler', (Handler,), {'store': Store(), 'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    server.store = handler.store
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description='Local mock of OpenSea and of the wallets.')
+    parser.add_argument('--port', type=int, default=8700)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every request.')
+    arguments = parser.parse_args()
+
+    server = serve(arguments.port, arguments.latency)
+    print(f'Mock OpenSea running on {server.url} (wallets on {server.url}/wallet).')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()